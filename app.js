@@ -3,6 +3,8 @@ document.addEventListener('DOMContentLoaded', function() {
     let allJobs = [];
     let uniqueLocations = new Set();
     let jobsTable; // DataTables instance
+    let searchIndex = null; // Prebuilt inverted index from the site bundle
+    let searchMatches = null; // Document IDs matching the search box, or null for no search
     
     // Get DOM elements
     const searchInput = document.getElementById('search-input');
@@ -109,45 +111,15 @@ document.addEventListener('DOMContentLoaded', function() {
     
     async function initApp() {
         try {
-            // Load all company job data
-            const companies = ['accenture', 'apple', 'meta', 'nvidia', 'salesforce', 'tesla'];
-            const promises = companies.map(company => 
-                fetch(`jobs/${company}_jobs_processed.json`)
-                    .then(response => {
-                        if (!response.ok) {
-                            throw new Error(`Failed to load ${company} jobs: ${response.status}`);
-                        }
-                        return response.json();
-                    })
-                    .then(data => {
-                        // Add company name to each job
-                        return data.map(job => ({...job, company}));
-                    })
-                    .catch(error => {
-                        console.error(error);
-                        return []; // Return empty array if fetch fails
-                    })
-            );
-            
-            // Wait for all data to be fetched
-            const results = await Promise.all(promises);
-            
-            // Combine all jobs into one array
-            allJobs = results.flat();
-            
-            // Get unique locations for the filter
-            allJobs.forEach(job => {
-                if (job.Location && typeof job.Location === 'string') {
-                    // Clean up and normalize location
-                    const cleanLocation = job.Location.trim();
-                    if (cleanLocation) {
-                        uniqueLocations.add(cleanLocation);
-                    }
-                }
-            });
+            // The sharded bundle built by scripts/build_site_bundle.py lists every company it holds
+            const manifest = await fetchJson('jobs/site/manifest.json').catch(() => null);
+            if (!manifest) {
+                throw new Error('No site bundle found. Run scripts/build_site_bundle.py to build jobs/site/.');
+            }
+            await loadRecentShards(manifest);
             
             // Update stats
-            updateStats();
+            updateStats(manifest);
             
             // Initialize DataTable
             initDataTable();
@@ -161,6 +133,9 @@ document.addEventListener('DOMContentLoaded', function() {
             // Add event listener for theme toggle
             themeToggle.addEventListener('click', toggleTheme);
             
+            // Stream in the archive shards and the search index after the first render
+            await Promise.all([streamArchiveShards(manifest), loadSearchIndex(manifest)]);
+            
         } catch (error) {
             console.error('Error initializing app:', error);
             document.querySelector('.table-container').innerHTML = `<div class="error-message">
@@ -171,19 +146,117 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
     
-    function updateStats() {
-        // Update total jobs count
-        totalCountEl.textContent = allJobs.length.toLocaleString();
+    async function fetchJson(url) {
+        const response = await fetch(url);
+        if (!response.ok) {
+            throw new Error(`Failed to load ${url}: ${response.status}`);
+        }
+        return response.json();
+    }
+    
+    // Fetch a bundle shard, using the precompressed .gz variant when the browser can inflate it
+    async function fetchShard(file) {
+        const url = `jobs/site/${file}`;
+        if ('DecompressionStream' in window) {
+            try {
+                const response = await fetch(`${url}.gz`);
+                if (response.ok) {
+                    const stream = response.body.pipeThrough(new DecompressionStream('gzip'));
+                    return JSON.parse(await new Response(stream).text());
+                }
+            } catch (error) {
+                // Fall back to the uncompressed shard (e.g. if the server already decoded it)
+            }
+        }
+        return fetchJson(url);
+    }
+    
+    // Turn compact shard rows back into job objects; docId matches the search index
+    function shardJobs(manifest, shard, rows) {
+        return rows.map((row, i) => {
+            const job = {company: shard.company, docId: shard.offset + i};
+            manifest.columns.forEach((column, i) => { job[column] = row[i]; });
+            return job;
+        });
+    }
+    
+    // Load the recent shards so the table can render before the archive arrives
+    async function loadRecentShards(manifest) {
+        const recentShards = manifest.shards.filter(shard => shard.recency === 'recent');
+        const recent = await Promise.all(recentShards.map(shard =>
+            fetchShard(shard.file).then(rows => shardJobs(manifest, shard, rows))
+        ));
+        addJobs(recent.flat());
+    }
+    
+    // Add the archive shards to the rendered table as they arrive
+    function streamArchiveShards(manifest) {
+        const archiveShards = manifest.shards.filter(shard => shard.recency !== 'recent');
+        return Promise.all(archiveShards.map(shard =>
+            fetchShard(shard.file)
+                .then(rows => {
+                    const jobs = shardJobs(manifest, shard, rows);
+                    addJobs(jobs);
+                    jobsTable.rows.add(jobs.map(toTableRow)).draw(false);
+                })
+                .catch(error => console.error(error))
+        )).then(() => {
+            updateStats(manifest);
+            populateLocationFilter();
+        });
+    }
+    
+    async function loadSearchIndex(manifest) {
+        if (!manifest.search_index) return;
+        try {
+            searchIndex = new SearchIndex(await fetchShard(manifest.search_index.file));
+        } catch (error) {
+            console.error('Search index unavailable, using table search:', error);
+            return;
+        }
+        
+        // Rows are kept when the index matched their document ID
+        $.fn.dataTable.ext.search.push((settings, data, dataIndex, rowData) =>
+            searchMatches === null || searchMatches.has(rowData[5])
+        );
+        
+        // Move any query typed while the index was loading over to the index
+        const query = searchInput.value;
+        jobsTable.search('');
+        searchMatches = searchIndex.search(query);
+        jobsTable.draw(false);
+    }
+    
+    function addJobs(jobs) {
+        allJobs.push(...jobs);
+        
+        // Get unique locations for the filter
+        jobs.forEach(job => {
+            if (job.Location && typeof job.Location === 'string') {
+                // Clean up and normalize location
+                const cleanLocation = job.Location.trim();
+                if (cleanLocation) {
+                    uniqueLocations.add(cleanLocation);
+                }
+            }
+        });
+    }
+    
+    function updateStats(manifest) {
+        // Update total jobs count (the manifest knows the total before every shard has arrived)
+        totalCountEl.textContent = (manifest ? manifest.total : allJobs.length).toLocaleString();
         
         // Update companies count (unique companies)
-        const uniqueCompanies = new Set(allJobs.map(job => job.company));
-        companiesCountEl.textContent = uniqueCompanies.size;
+        const uniqueCompanies = manifest
+            ? Object.keys(manifest.companies).filter(company => manifest.companies[company].count > 0)
+            : new Set(allJobs.map(job => job.company));
+        companiesCountEl.textContent = manifest ? uniqueCompanies.length : uniqueCompanies.size;
         
         // Update locations count
         locationsCountEl.textContent = uniqueLocations.size;
         
         // Update last updated date
-        const today = new Date();
+        const today = manifest ? new Date(manifest.last_updated) : new Date();
         const formattedDate = today.toLocaleString('en-US', {
             year: 'numeric',
             month: 'long',
@@ -195,41 +268,44 @@ document.addEventListener('DOMContentLoaded', function() {
         footerLastUpdatedEl.textContent = formattedDate;
     }
     
+    function toTableRow(job) {
+        // Select the appropriate logo based on theme
+        const isDarkMode = document.body.classList.contains('dark-theme');
+        const logoSrc = isDarkMode ? companyLogosDark[job.company] : companyLogosLight[job.company];
+        
+        // Create company logo cell
+        const companyLogo = logoSrc ? `<img src="${logoSrc}" alt="${job.company} logo" class="company-logo">` : '';
+        
+        // Format company name with first letter capitalized
+        const companyName = job.company.charAt(0).toUpperCase() + job.company.slice(1);
+        
+        // Combine logo and company name
+        const company = `<div class="company-cell">${companyLogo} <span>${companyName}</span></div>`;
+        
+        // Format job title with "New" badge if recent
+        let title = job.Title || 'Unknown Title';
+        if (isRecentDate(job["Posted Date"])) {
+            title = `${title} <span class="new-badge">New</span>`;
+        }
+        
+        // Format location with icon
+        const location = `<span class="job-location"><span class="material-icons">location_on</span> ${job.Location || 'Remote/Various'}</span>`;
+        
+        // Format date
+        const date = job["Posted Date"] || 'Unknown date';
+        
+        // Format action button with academicpages style
+        const action = `<a href="${job["Job URL"] || '#'}" target="_blank" class="btn-primary">
+            <span class="material-icons" style="font-size: 0.9em; margin-right: 3px;">open_in_new</span> View
+        </a>`;
+        
+        // The trailing document ID is not a column; the search filter reads it from the row data
+        return [company, title, location, date, action, job.docId];
+    }
+    
     function initDataTable() {
         // Format jobs data for DataTable
-        const tableData = allJobs.map(job => {
-            // Select the appropriate logo based on theme
-            const isDarkMode = document.body.classList.contains('dark-theme');
-            const logoSrc = isDarkMode ? companyLogosDark[job.company] : companyLogosLight[job.company];
-            
-            // Create company logo cell
-            const companyLogo = `<img src="${logoSrc}" alt="${job.company} logo" class="company-logo">`;
-            
-            // Format company name with first letter capitalized
-            const companyName = job.company.charAt(0).toUpperCase() + job.company.slice(1);
-            
-            // Combine logo and company name
-            const company = `<div class="company-cell">${companyLogo} <span>${companyName}</span></div>`;
-            
-            // Format job title with "New" badge if recent
-            let title = job.Title || 'Unknown Title';
-            if (isRecentDate(job["Posted Date"])) {
-                title = `${title} <span class="new-badge">New</span>`;
-            }
-            
-            // Format location with icon
-            const location = `<span class="job-location"><span class="material-icons">location_on</span> ${job.Location || 'Remote/Various'}</span>`;
-            
-            // Format date
-            const date = job["Posted Date"] || 'Unknown date';
-            
-            // Format action button with academicpages style
-            const action = `<a href="${job["Job URL"] || '#'}" target="_blank" class="btn-primary">
-                <span class="material-icons" style="font-size: 0.9em; margin-right: 3px;">open_in_new</span> View
-            </a>`;
-            
-            return [company, title, location, date, action];
-        });
+        const tableData = allJobs.map(toTableRow);
         
         // Initialize DataTable
         jobsTable = $('#jobs-table').DataTable({
@@ -267,9 +343,14 @@ document.addEventListener('DOMContentLoaded', function() {
         // Replace the default search input with our custom one
         $('#jobs-table_filter').hide();
         
-        // Connect our existing search box to DataTable search
-        $('#search-input').on('keyup', function() {
-            jobsTable.search(this.value).draw();
+        // Connect our existing search box to the prebuilt index, or DataTable search without one
+        $('#search-input').off('keyup').on('keyup', function() {
+            if (searchIndex) {
+                searchMatches = searchIndex.search(this.value);
+                jobsTable.draw();
+            } else {
+                jobsTable.search(this.value).draw();
+            }
         });
         
         // Setup custom filtering for DataTables
@@ -347,6 +428,9 @@ document.addEventListener('DOMContentLoaded', function() {
             });
         }
         
+        // Drop items from an earlier call so locations streamed in later are not duplicated
+        locationDropdown.querySelectorAll('.dropdown-item:not([data-value="all"])').forEach(item => item.remove());
+        
         // Sort locations alphabetically
         const sortedLocations = Array.from(uniqueLocations).sort();
         
@@ -414,3 +498,97 @@ document.addEventListener('DOMContentLoaded', function() {
                lowerDateStr.includes('just posted');
     }
 });
+
+// Query API over the index written by scripts/search_index.py (mirrors its SearchIndex class)
+class SearchIndex {
+    constructor(data) {
+        this.docCount = data.doc_count;
+        this.vocabulary = data.vocabulary;
+        this.postings = data.postings;
+        this.facets = data.facets;
+        this.decoded = new Map();
+    }
+    
+    static tokenize(text) {
+        return typeof text === 'string' ? (text.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || []) : [];
+    }
+    
+    static undelta(deltas) {
+        const ids = [];
+        let total = 0;
+        for (const delta of deltas) {
+            total += delta;
+            ids.push(total);
+        }
+        return ids;
+    }
+    
+    // First vocabulary position whose token is >= value
+    lowerBound(value, start = 0) {
+        let low = start;
+        let high = this.vocabulary.length;
+        while (low < high) {
+            const mid = (low + high) >>> 1;
+            if (this.vocabulary[mid] < value) {
+                low = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        return low;
+    }
+    
+    posting(position) {
+        let ids = this.decoded.get(position);
+        if (!ids) {
+            ids = SearchIndex.undelta(this.postings[position]);
+            this.decoded.set(position, ids);
+        }
+        return ids;
+    }
+    
+    lookupPrefix(prefix) {
+        const start = this.lowerBound(prefix);
+        const end = this.lowerBound(prefix + '\uffff', start);
+        const matches = new Set();
+        for (let position = start; position < end; position++) {
+            for (const id of this.posting(position)) {
+                matches.add(id);
+            }
+        }
+        return matches;
+    }
+    
+    facet(name, value) {
+        const facet = (this.facets[name] || {})[value];
+        if (!facet) return new Set();
+        if (facet.ids) return new Set(SearchIndex.undelta(facet.ids));
+        const bitmap = atob(facet.bitmap);
+        const ids = new Set();
+        for (let byteIndex = 0; byteIndex < bitmap.length; byteIndex++) {
+            const byte = bitmap.charCodeAt(byteIndex);
+            for (let bit = 0; byte && bit < 8; bit++) {
+                if (byte & (1 << bit)) ids.add((byteIndex << 3) | bit);
+            }
+        }
+        return ids;
+    }
+    
+    // Document IDs matching every query token as a prefix and the given facets; null means no filter
+    search(query, {company = null, location = null} = {}) {
+        const tokens = [...new Set(SearchIndex.tokenize(query))].sort((a, b) => b.length - a.length);
+        let result = null;
+        for (const token of tokens) {
+            const matches = this.lookupPrefix(token);
+            result = result === null ? matches : new Set([...result].filter(id => matches.has(id)));
+            if (result.size === 0) return result;
+        }
+        for (const [name, value] of [['company', company], ['location', location]]) {
+            if (value) {
+                const matches = this.facet(name, value);
+                result = result === null ? matches : new Set([...result].filter(id => matches.has(id)));
+            }
+        }
+        return result;
+    }
+}
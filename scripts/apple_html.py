@@ -0,0 +1,81 @@
+"""
+Single-pass lxml extractor for jobs.apple.com search result pages.
+Each page is parsed once with libxml2. Precompiled XPath expressions pull every field
+out of each listing and read the pagination controls from the same tree.
+"""
+
+from lxml import etree, html as lxml_html
+
+APPLE_BASE_URL = "https://jobs.apple.com"
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+JOB_ITEMS = etree.XPath("//li[@data-core-accordion-item and @role='listitem']")
+TITLE_LINK = etree.XPath(f".//a[{_has_class('link-inline')}][1]")
+ROLE_NUMBER = etree.XPath(".//span[contains(@id, 'search-role-number')][1]")
+TEAM_NAME = etree.XPath(f".//span[{_has_class('team-name')}][1]")
+LOCATION = etree.XPath(f".//span[{_has_class('table--advanced-search__location-sub')}][1]")
+POSTED_DATE = etree.XPath(f".//span[{_has_class('job-posted-date')}][1]")
+SUMMARY = etree.XPath(f".//p[{_has_class('text-align-start')}][1]")
+WEEKLY_HOURS = etree.XPath(".//span[contains(@id, 'search-weekly-hours')][1]")
+
+# A "Next" link, or a Next / Load more / Show more button, means there is another page
+_LOWER_TEXT = "translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+HAS_MORE_PAGES = etree.XPath(
+    "boolean(//a[@aria-label='Next'] | "
+    f"//button[contains({_LOWER_TEXT}, 'next') or contains({_LOWER_TEXT}, 'load more') or contains({_LOWER_TEXT}, 'show more')])"
+)
+
+
+def _text(elements):
+    """Text of the first matched element with each text node stripped, like BeautifulSoup's get_text(strip=True)."""
+    if not elements:
+        return ""
+    return "".join(text.strip() for text in elements[0].itertext())
+
+
+def _role_number_from_url(job_url):
+    # URLs look like /en-us/details/200313970/in-business-expert
+    parts = job_url.split("/details/", 1)
+    if len(parts) == 2:
+        candidate = parts[1].split("/", 1)[0]
+        if candidate.isdigit():
+            return candidate
+    return ""
+
+
+def parse_results_page(html_content):
+    """
+    Parse one search results page.
+
+    Returns:
+        tuple: (jobs, has_more) where `jobs` is a list of job dicts without scrape
+            metadata and `has_more` tells whether the page links to another page
+    """
+    if not html_content:
+        return [], False
+
+    tree = lxml_html.fromstring(html_content)
+    jobs = []
+    for item in JOB_ITEMS(tree):
+        title_link = TITLE_LINK(item)
+        if not title_link:
+            continue
+
+        job_url = APPLE_BASE_URL + title_link[0].get("href", "")
+        jobs.append({
+            "Job ID": _text(ROLE_NUMBER(item)) or _role_number_from_url(job_url),
+            "Title": _text(title_link),
+            "Location": _text(LOCATION(item)),
+            "Posted Date": _text(POSTED_DATE(item)),
+            "Job URL": job_url,
+            "Team": _text(TEAM_NAME(item)),
+            "Weekly Hours": _text(WEEKLY_HOURS(item)),
+            "Summary": _text(SUMMARY(item)),
+            "Company": "Apple",
+        })
+
+    return jobs, HAS_MORE_PAGES(tree)
@@ -0,0 +1,153 @@
+"""
+Search and pagination client for jobs.apple.com (the source adapter is AppleAdapter in
+apple_jobs_scraper.py).
+Every search page embeds its results as structured JSON (the router hydration data
+that the page's React app starts from), including the total number of matching roles.
+This module reads that data, learns the page count from the first page and fetches
+the remaining pages concurrently through the shared fetch scheduler. Pages without
+hydration data fall back to the lxml HTML extractor.
+"""
+
+import asyncio
+import json
+import re
+from apple_html import parse_results_page
+from fetch_scheduler import get_scheduler
+from job_store import crawl_pages
+from log_utils import get_logger
+
+log = get_logger("apple_search")
+
+APPLE_BASE_URL = "https://jobs.apple.com"
+APPLE_SEARCH_URL = f"{APPLE_BASE_URL}/en-us/search"
+APPLE_PAGE_SIZE = 20
+
+HYDRATION_PATTERN = re.compile(r'window\.__staticRouterHydrationData\s*=\s*JSON\.parse\(("(?:[^"\\]|\\.)*")\)', re.DOTALL)
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+def extract_hydration_data(html_content):
+    """Return the search loader data embedded in a results page, or None."""
+    match = HYDRATION_PATTERN.search(html_content or "")
+    if not match:
+        return None
+    try:
+        # The payload is a JSON document inside a JavaScript string literal
+        data = json.loads(json.loads(match.group(1)))
+    except ValueError:
+        return None
+    return (data.get("loaderData") or {}).get("search")
+
+
+def job_from_result(result):
+    """Map one structured search result to the archive's job fields."""
+    position_id = str(result.get("positionId") or result.get("id") or "")
+    team = result.get("team") or {}
+    locations = result.get("locations") or []
+    slug = result.get("transformedPostingTitle") or ""
+    job_url = f"{APPLE_BASE_URL}/en-us/details/{position_id}/{slug}"
+    if team.get("teamCode"):
+        job_url += f"?team={team['teamCode']}"
+    weekly_hours = result.get("standardWeeklyHours")
+
+    return {
+        "Job ID": position_id,
+        "Title": result.get("postingTitle", ""),
+        "Location": locations[0].get("name", "") if locations else "",
+        "Posted Date": result.get("postingDate", ""),
+        "Job URL": job_url,
+        "Team": team.get("teamName", ""),
+        "Weekly Hours": f"{weekly_hours} Hours" if weekly_hours else "",
+        "Summary": result.get("jobSummary", ""),
+        "Company": "Apple",
+    }
+
+
+def parse_search_page(html_content):
+    """
+    Parse one results page.
+
+    Returns:
+        tuple: (jobs, total) where `total` is the number of matching roles, or None
+            when the page had no structured data and the HTML fallback was used
+    """
+    search = extract_hydration_data(html_content)
+    if search is not None:
+        jobs = [job_from_result(result) for result in search.get("searchResults", [])]
+        return jobs, search.get("totalRecords")
+    jobs, _ = parse_results_page(html_content)
+    return jobs, None
+
+
+class AppleSearchClient:
+    """Fetch Apple search result pages concurrently through the shared fetch scheduler."""
+
+    def __init__(self, sort="newest", concurrency=8, scheduler=None):
+        self.sort = sort
+        self.concurrency = concurrency
+        self.scheduler = scheduler or get_scheduler()
+
+    def _get_page(self, page):
+        response = self.scheduler.get(APPLE_SEARCH_URL, params={"sort": self.sort, "page": page}, headers=HEADERS)
+        response.raise_for_status()
+        return parse_search_page(response.text)
+
+    async def fetch_page(self, page):
+        return await asyncio.to_thread(self._get_page, page)
+
+    async def _fetch_pages(self, pages, semaphore):
+        async def fetch(page):
+            async with semaphore:
+                try:
+                    jobs, _ = await self.fetch_page(page)
+                    return jobs
+                except Exception as e:
+                    log.warning("[!] Apple request failed for page %s: %s", page, e)
+                    return None
+
+        return await asyncio.gather(*(fetch(page) for page in pages))
+
+    async def fetch_all(self, known_ids=None):
+        """
+        Fetch every page of results.
+
+        Args:
+            known_ids (set): Job IDs already stored. When given (newest-first sort only),
+                pages are fetched in waves and the crawl stops at the first page made
+                up entirely of known jobs.
+
+        Returns:
+            tuple: (jobs, complete) where `complete` is True only if every page was fetched
+        """
+        try:
+            jobs, total = await self.fetch_page(1)
+        except Exception as e:
+            log.warning("[!] Apple search request failed: %s", e)
+            return [], False
+        if total is None:
+            log.warning("[!] No structured search data on the first page, using its HTML listings only")
+            return jobs, False
+
+        page_count = -(-total // APPLE_PAGE_SIZE)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        log.info("[*] Apple: %s roles reported across %s pages", total, page_count)
+        return await crawl_pages(
+            lambda pages: self._fetch_pages(pages, semaphore),
+            list(range(2, page_count + 1)),
+            jobs,
+            lambda job: job["Job ID"] or job["Job URL"],
+            known=known_ids if self.sort == "newest" else None,
+            wave_size=self.concurrency,
+            label="Apple",
+        )
+
+
+def fetch_apple_jobs(sort="newest", concurrency=8, known_ids=None):
+    """Synchronous wrapper that fetches every Apple role (or only the new ones)."""
+    client = AppleSearchClient(sort=sort, concurrency=concurrency)
+    return asyncio.run(client.fetch_all(known_ids))
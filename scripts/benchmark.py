@@ -0,0 +1,246 @@
+"""
+Benchmark the scrapers offline against recorded responses.
+`record` runs each scraper against the live site once and saves what it sees under
+fixtures/replay/<company>/. `run` replays those recordings through a local
+ReplayServer (see replay.py) with optional latency and injected errors, running each
+scraper in a child process. It reports wall time, pages and records per second, CPU
+time and peak RSS per scraper, and compares them with the stored baselines.
+
+Usage:
+    python benchmark.py record tesla apple     # record fixtures from the live sites
+    python benchmark.py run                    # benchmark every recorded scraper
+    python benchmark.py run --latency 0.05 --error-rate 0.05 --rounds 5
+    python benchmark.py run --save-baseline    # store the results as the new baselines
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from http_cache import NO_CACHE_ENV_VAR
+from replay import FixtureStore, RECORD_ENV_VAR, REPLAY_SERVER_ENV_VAR, ReplayServer
+from sources import JOBS_DIR_ENV_VAR
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(SCRIPT_DIR, "fixtures", "replay")
+BASELINE_FILE = os.path.join(FIXTURES_DIR, "baselines.json")
+
+# Metrics where a higher value is a regression, compared against the baseline
+REGRESSION_METRICS = ("wall_seconds", "cpu_seconds", "peak_rss_mb")
+
+
+def run_child(company, env, log_path):
+    """
+    Run one scraper in a child process.
+
+    Returns:
+        dict: The child's result plus its CPU time and peak RSS
+    """
+    with tempfile.NamedTemporaryFile("r", suffix=".json", delete=False) as result_file:
+        result_path = result_file.name
+    started = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        process = subprocess.Popen([sys.executable, os.path.abspath(__file__), "child", company, result_path],
+                                   cwd=SCRIPT_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+    wall_seconds = time.perf_counter() - started
+
+    try:
+        with open(result_path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        result = {"records": 0, "error": f"exited with status {process.returncode}"}
+    finally:
+        os.remove(result_path)
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    rss_bytes = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    result.update({
+        "process_seconds": wall_seconds,
+        "cpu_seconds": usage.ru_utime + usage.ru_stime,
+        "peak_rss_mb": rss_bytes / (1024 * 1024),
+        "returncode": process.returncode,
+    })
+    return result
+
+
+def child(company, result_path):
+    """Entry point of the child process: run one scraper through the pipeline and time it."""
+    from sources import get_adapter, run_pipeline
+
+    result = {"records": 0, "error": None}
+    started = time.perf_counter()
+    try:
+        result["records"] = run_pipeline(get_adapter(company))
+    except Exception as e:
+        result["error"] = str(e)
+    result["wall_seconds"] = time.perf_counter() - started
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+def child_env(jobs_dir, **overrides):
+    env = dict(os.environ)
+    env.pop(RECORD_ENV_VAR, None)
+    env.pop(REPLAY_SERVER_ENV_VAR, None)
+    # Always run the full pipeline into a scratch directory, never into jobs/
+    env[NO_CACHE_ENV_VAR] = "1"
+    env[JOBS_DIR_ENV_VAR] = jobs_dir
+    env.update(overrides)
+    return env
+
+
+def recorded_companies():
+    if not os.path.isdir(FIXTURES_DIR):
+        return []
+    return sorted(name for name in os.listdir(FIXTURES_DIR)
+                  if os.path.exists(os.path.join(FIXTURES_DIR, name, "exchanges.jsonl")))
+
+
+def record(companies):
+    from sources import load_adapters
+
+    companies = companies or sorted(load_adapters())
+    for company in companies:
+        fixture_dir = os.path.join(FIXTURES_DIR, company)
+        shutil.rmtree(fixture_dir, ignore_errors=True)
+        with tempfile.TemporaryDirectory() as jobs_dir:
+            log_path = os.path.join(jobs_dir, "scraper.log")
+            result = run_child(company, child_env(jobs_dir, **{RECORD_ENV_VAR: fixture_dir}), log_path)
+            if result.get("error") or result["returncode"]:
+                with open(log_path, "r", encoding="utf-8") as f:
+                    print(f.read()[-2000:])
+        exchanges = len(FixtureStore(fixture_dir)) if os.path.isdir(fixture_dir) else 0
+        print(f"{company:<12} recorded {exchanges} responses, {result['records']} records"
+              + (f" (error: {result['error']})" if result.get("error") else ""))
+
+
+def benchmark(company, rounds, latency, jitter, error_rate, verbose=False):
+    """Replay one company's fixtures `rounds` times and summarize the runs."""
+    server = ReplayServer(FixtureStore(os.path.join(FIXTURES_DIR, company)),
+                          latency=latency, jitter=jitter, error_rate=error_rate, seed=0)
+    runs = []
+    with server, tempfile.TemporaryDirectory() as scratch:
+        for round_number in range(rounds):
+            server.reset_stats()
+            jobs_dir = os.path.join(scratch, f"round-{round_number}")
+            log_path = os.path.join(scratch, f"round-{round_number}.log")
+            result = run_child(company, child_env(jobs_dir, **{REPLAY_SERVER_ENV_VAR: server.url}), log_path)
+            result.update(server.stats)
+            runs.append(result)
+            if verbose or result.get("error") or result["returncode"]:
+                with open(log_path, "r", encoding="utf-8") as f:
+                    print(f.read()[-2000:])
+
+    wall = statistics.median(run["wall_seconds"] for run in runs)
+    pages = runs[-1]["served"]
+    records = runs[-1]["records"]
+    return {
+        "wall_seconds": round(wall, 3),
+        "pages": pages,
+        "pages_per_second": round(pages / wall, 1) if wall else None,
+        "records": records,
+        "records_per_second": round(records / wall, 1) if wall else None,
+        "cpu_seconds": round(statistics.median(run["cpu_seconds"] for run in runs), 3),
+        "peak_rss_mb": round(max(run["peak_rss_mb"] for run in runs), 1),
+        "missing": runs[-1]["missing"],
+        "injected_errors": sum(run["errors"] for run in runs),
+        "failed_runs": sum(1 for run in runs if run.get("error") or run["returncode"]),
+    }
+
+
+def load_baselines():
+    try:
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def compare(result, baseline, tolerance):
+    """Describe the change of each regression metric against the baseline; return (text, regressed)."""
+    if not baseline:
+        return "no baseline", False
+    changes, regressed = [], False
+    for metric in REGRESSION_METRICS:
+        before, after = baseline.get(metric), result.get(metric)
+        if not before or after is None:
+            continue
+        change = (after - before) / before
+        if change > tolerance:
+            regressed = True
+            changes.append(f"{metric} +{change:.0%} REGRESSION")
+        else:
+            changes.append(f"{metric} {change:+.0%}")
+    return ", ".join(changes), regressed
+
+
+def run(companies, args):
+    available = recorded_companies()
+    companies = companies or available
+    missing = [company for company in companies if company not in available]
+    if missing:
+        print(f"No fixtures for {', '.join(missing)}; record them with: python benchmark.py record {' '.join(missing)}")
+        companies = [company for company in companies if company in available]
+    if not companies:
+        return 0
+
+    print(f"Replaying {len(companies)} scrapers, {args.rounds} rounds, "
+          f"latency {args.latency * 1000:.0f} ms, error rate {args.error_rate:.0%}")
+    print(f"{'company':<12} {'wall s':>8} {'pages/s':>8} {'recs/s':>9} {'cpu s':>7} {'rss MB':>7}")
+    baselines = load_baselines()
+    results, regressions = {}, 0
+    for company in companies:
+        result = benchmark(company, args.rounds, args.latency, args.jitter, args.error_rate, args.verbose)
+        results[company] = result
+        comparison, regressed = compare(result, baselines.get(company), args.tolerance)
+        regressions += regressed
+        print(f"{company:<12} {result['wall_seconds']:>8.2f} {result['pages_per_second'] or 0:>8.1f} "
+              f"{result['records_per_second'] or 0:>9.1f} {result['cpu_seconds']:>7.2f} {result['peak_rss_mb']:>7.1f}  {comparison}")
+        if result["missing"] or result["failed_runs"]:
+            print(f"{'':<12} {result['missing']} requests had no recording, {result['failed_runs']} runs failed")
+
+    if args.save_baseline:
+        baselines.update(results)
+        os.makedirs(FIXTURES_DIR, exist_ok=True)
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baselines saved to {BASELINE_FILE}")
+    return 1 if regressions else 0
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "child":
+        child(sys.argv[2], sys.argv[3])
+        return
+
+    parser = argparse.ArgumentParser(description="Record scraper fixtures and benchmark scrapers against them.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_command = commands.add_parser("record", help="Record fixtures from the live sites")
+    record_command.add_argument("companies", nargs="*")
+    run_command = commands.add_parser("run", help="Benchmark scrapers against their fixtures")
+    run_command.add_argument("companies", nargs="*")
+    run_command.add_argument("--rounds", type=int, default=3)
+    run_command.add_argument("--latency", type=float, default=0.0, help="Seconds added to every replayed response")
+    run_command.add_argument("--jitter", type=float, default=0.0, help="Random extra delay of up to this many seconds")
+    run_command.add_argument("--error-rate", type=float, default=0.0, help="Fraction of responses replaced by a 503")
+    run_command.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before a regression is reported")
+    run_command.add_argument("--save-baseline", action="store_true")
+    run_command.add_argument("--verbose", action="store_true", help="Print each run's scraper output")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.companies)
+    else:
+        sys.exit(run(args.companies, args))
+
+
+if __name__ == "__main__":
+    main()
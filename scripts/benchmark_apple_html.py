@@ -0,0 +1,148 @@
+"""
+Benchmark the Apple results-page extractor against saved fixture pages.
+Compares apple_html.parse_results_page with the previous BeautifulSoup html.parser
+extraction (when beautifulsoup4 is installed), checks that both return the same jobs
+and reports the CPU time per page.
+
+Usage:
+    python benchmark_apple_html.py --save 5       # save 5 live search pages as fixtures
+    python benchmark_apple_html.py                # benchmark the saved fixtures
+    python benchmark_apple_html.py --synthetic    # benchmark generated pages instead
+"""
+
+import argparse
+import glob
+import html
+import os
+import re
+import time
+from apple_html import parse_results_page
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "apple")
+
+
+def bs4_extract(html_content):
+    """The html.parser extraction this module replaced, kept as the benchmark baseline."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, "html.parser")
+    jobs = []
+    for item in soup.find_all("li", {"data-core-accordion-item": True, "role": "listitem"}):
+        title_link = item.find("a", class_="link-inline")
+        if not title_link:
+            continue
+        job_url = "https://jobs.apple.com" + title_link.get("href", "")
+        role_number_elem = item.find("span", id=re.compile(r"search-role-number.*"))
+        if role_number_elem:
+            role_number = role_number_elem.get_text(strip=True)
+        else:
+            url_match = re.search(r"/details/(\d+)/", job_url)
+            role_number = url_match.group(1) if url_match else ""
+
+        def text_of(elem):
+            return elem.get_text(strip=True) if elem else ""
+
+        jobs.append({
+            "Job ID": role_number,
+            "Title": title_link.get_text(strip=True),
+            "Location": text_of(item.find("span", class_="table--advanced-search__location-sub")),
+            "Posted Date": text_of(item.find("span", class_="job-posted-date")),
+            "Job URL": job_url,
+            "Team": text_of(item.find("span", class_="team-name")),
+            "Weekly Hours": text_of(item.find("span", id=re.compile(r"search-weekly-hours.*"))),
+            "Summary": text_of(item.find("p", class_="text-align-start")),
+            "Company": "Apple",
+        })
+
+    # The old scraper parsed the page a second time to look for pagination controls
+    soup = BeautifulSoup(html_content, "html.parser")
+    next_button = soup.find("a", {"aria-label": "Next"}) or soup.find("button", string=lambda t: t and "next" in t.lower())
+    load_more = soup.find("button", string=lambda t: t and ("load more" in t.lower() or "show more" in t.lower()))
+    return jobs, bool(next_button or load_more)
+
+
+def synthetic_page(page, rows=20):
+    """A results page with the same markup the extractor targets, for runs without fixtures."""
+    items = []
+    for row in range(rows):
+        role = 200000000 + page * rows + row
+        items.append(f"""
+        <li data-core-accordion-item="" role="listitem">
+          <div class="job-title"><h3><a class="link-inline t-intro word-wrap-break-word" href="/en-us/details/{role}/role-{row}?team=SFTWR">Software Engineer {html.escape('&')} Role {row}</a></h3>
+            <span class="team-name mt-0">Software and Services</span></div>
+          <span id="search-role-number-{role}">{role}</span>
+          <span class="table--advanced-search__location-sub">Cupertino</span>
+          <span class="job-posted-date">Aug 0{1 + row % 9}, 2026</span>
+          <span id="search-weekly-hours-{role}">40 Hours</span>
+          <p class="text-align-start">Join the team building <b>great</b> products. {'Lorem ipsum dolor sit amet. ' * 10}</p>
+        </li>""")
+    nav = '<a aria-label="Next" href="?page=2">Next</a>' if page < 4 else ""
+    return f"<html><head><title>Jobs</title></head><body><ul>{''.join(items)}</ul>{nav}</body></html>"
+
+
+def save_fixtures(count):
+    from fetch_scheduler import get_scheduler
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    scheduler = get_scheduler()
+    for page in range(1, count + 1):
+        response = scheduler.get(f"https://jobs.apple.com/en-us/search?sort=newest&page={page}",
+                                 headers={"User-Agent": "Mozilla/5.0"})
+        response.raise_for_status()
+        path = os.path.join(FIXTURE_DIR, f"search_page_{page}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(response.text)
+        print(f"Saved {path}")
+
+
+def cpu_per_page(extract, pages, rounds):
+    started = time.process_time()
+    for _ in range(rounds):
+        for page in pages:
+            extract(page)
+    return (time.process_time() - started) / (rounds * len(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Apple results-page extractor.")
+    parser.add_argument("--save", type=int, metavar="PAGES", help="Save live search pages as fixtures and exit")
+    parser.add_argument("--synthetic", action="store_true", help="Benchmark generated pages instead of fixtures")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.save:
+        save_fixtures(args.save)
+        return
+
+    if args.synthetic:
+        pages = [synthetic_page(page) for page in range(5)]
+        source = "synthetic pages"
+    else:
+        paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+        if not paths:
+            print(f"No fixtures in {FIXTURE_DIR}; run with --save N or --synthetic")
+            return
+        pages = []
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                pages.append(f.read())
+        source = f"{len(paths)} fixture pages"
+
+    lxml_seconds = cpu_per_page(parse_results_page, pages, args.rounds)
+    print(f"Benchmarking {source}, {args.rounds} rounds")
+    print(f"  lxml XPath:        {lxml_seconds * 1000:8.2f} ms CPU per page")
+
+    try:
+        import bs4  # noqa: F401
+    except ImportError:
+        print("  beautifulsoup4 not installed, skipping the html.parser baseline")
+        return
+
+    mismatches = sum(1 for page in pages if parse_results_page(page) != bs4_extract(page))
+    bs4_seconds = cpu_per_page(bs4_extract, pages, args.rounds)
+    print(f"  bs4 html.parser:   {bs4_seconds * 1000:8.2f} ms CPU per page")
+    print(f"  Speedup: {bs4_seconds / lxml_seconds:.1f}x, pages with different results: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
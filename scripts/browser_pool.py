@@ -0,0 +1,252 @@
+"""
+Shared Playwright browser for scrapers that run in the same process.
+Playwright's sync API is bound to the thread that started it, so the pool owns one
+Chromium instance on a dedicated thread and runs each scraper's browser work there,
+in its own context per company.
+
+Scrapers only open careers pages to read the JSON API responses the page requests,
+so Chromium is launched headless with a minimal set of flags and every context aborts
+images, fonts, stylesheets and media, requests to analytics and ad hosts, and
+(when the scraper names its first-party domains) every other third-party host.
+"""
+
+import contextvars
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from playwright.sync_api import sync_playwright
+import metrics
+import replay
+from log_utils import get_logger
+
+log = get_logger("browser_pool")
+
+LAUNCH_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+]
+
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet", "texttrack", "manifest", "other"}
+
+# Analytics, tag managers and ad networks the careers pages load alongside their app
+BLOCKED_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "adobedtm.com", "omtrdc.net", "demdex.net", "everesttech.net",
+    "hotjar.com", "optimizely.com", "onetrust.com", "cookielaw.org", "newrelic.com", "nr-data.net",
+    "segment.io", "linkedin.com", "licdn.com", "bing.com", "clarity.ms", "qualtrics.com",
+)
+
+
+def _host_matches(host, domains):
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+def launch(playwright, headless=True):
+    with metrics.span("browser_start"):
+        return playwright.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+
+
+def prepare_context(context, allowed_domains=None):
+    """
+    Set up a new context: replay/recording first, then resource blocking in front of it.
+
+    Args:
+        allowed_domains (tuple): First-party domains (with their subdomains) the page
+            may load from; None to only block the known analytics and ad hosts
+    """
+    replay.attach(context)
+
+    def block(route):
+        request = route.request
+        host = urlsplit(request.url).hostname or ""
+        if (request.resource_type in BLOCKED_RESOURCE_TYPES or _host_matches(host, BLOCKED_HOSTS)
+                or (allowed_domains and not _host_matches(host, allowed_domains))):
+            metrics.count("browser_blocked_requests")
+            route.abort()
+        else:
+            route.fallback()
+
+    # Routes registered last run first, so blocked requests never reach the replay route
+    context.route("**/*", block)
+    if metrics.enabled():
+        def count_bytes(request):
+            try:
+                metrics.count("browser_bytes", request.sizes()["responseBodySize"])
+            except Exception:
+                pass
+
+        context.on("requestfinished", count_bytes)
+    return context
+
+
+class BrowserPool:
+    """One lazily launched Chromium shared by every Playwright scraper."""
+
+    def __init__(self, headless=True):
+        self.headless = headless
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser")
+        self.playwright = None
+        self.browser = None
+
+    def _ensure_browser(self):
+        if self.browser is None:
+            log.info("[*] Launching shared browser...")
+            self.playwright = sync_playwright().start()
+            self.browser = launch(self.playwright, self.headless)
+        return self.browser
+
+    def run(self, company, fn, allowed_domains=None):
+        """
+        Run `fn(context)` on the browser thread with a fresh context for `company`.
+
+        Returns:
+            Whatever `fn` returns
+        """
+        def task():
+            context = prepare_context(self._ensure_browser().new_context(), allowed_domains)
+            log.debug("[*] Opened browser context for %s", company)
+            try:
+                return fn(context)
+            finally:
+                context.close()
+
+        # Keep the caller's source label for logs and metrics on the browser thread
+        return self.executor.submit(contextvars.copy_context().run, task).result()
+
+    def _shutdown(self):
+        if self.browser is not None:
+            self.browser.close()
+            self.browser = None
+        if self.playwright is not None:
+            self.playwright.stop()
+            self.playwright = None
+
+    def close(self):
+        self.executor.submit(self._shutdown).result()
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def run_in_browser(company, fn, browser_pool=None, allowed_domains=None, headless=True):
+    """Run `fn(context)` in the shared pool if one is given, otherwise in a private browser."""
+    if browser_pool is not None:
+        return browser_pool.run(company, fn, allowed_domains)
+
+    with sync_playwright() as p:
+        log.info("Launching browser...")
+        browser = launch(p, headless)
+        try:
+            return fn(prepare_context(browser.new_context(), allowed_domains))
+        finally:
+            browser.close()
+            log.info("Browser closed.")
+
+
+# Marks the element find_first_visible picked, so a locator can act on it
+TARGET_ATTRIBUTE = "data-jobs-scraper-target"
+TARGET_SELECTOR = f"[{TARGET_ATTRIBUTE}]"
+
+_FIND_FIRST_VISIBLE = """([targets, attribute]) => {
+    document.querySelectorAll(`[${attribute}]`).forEach(el => el.removeAttribute(attribute));
+    const visible = el => {
+        const rect = el.getBoundingClientRect();
+        const style = getComputedStyle(el);
+        return rect.width > 0 && rect.height > 0 && style.visibility !== "hidden" && style.display !== "none";
+    };
+    for (let i = 0; i < targets.length; i++) {
+        const [css, text] = targets[i];
+        let elements;
+        try {
+            elements = document.querySelectorAll(css);
+        } catch (e) {
+            continue;
+        }
+        for (const el of elements) {
+            if (visible(el) && (!text || el.textContent.toLowerCase().includes(text.toLowerCase()))) {
+                el.setAttribute(attribute, "");
+                return i;
+            }
+        }
+    }
+    return -1;
+}"""
+
+_ARM_CHANGE = """([urlPart, mutations]) => {
+    window.__jobsScraperChange = new Promise(resolve => {
+        let mutationObserver = null;
+        let performanceObserver = null;
+        const done = kind => {
+            if (mutationObserver) mutationObserver.disconnect();
+            if (performanceObserver) performanceObserver.disconnect();
+            resolve(kind);
+        };
+        if (mutations) {
+            mutationObserver = new MutationObserver(() => done("mutation"));
+            mutationObserver.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+        }
+        if (urlPart) {
+            performanceObserver = new PerformanceObserver(list => {
+                if (list.getEntries().some(entry => entry.name.includes(urlPart))) done("response");
+            });
+            performanceObserver.observe({type: "resource"});
+        }
+    });
+}"""
+
+_AWAIT_CHANGE = """(timeout) => Promise.race([
+    window.__jobsScraperChange,
+    new Promise(resolve => setTimeout(() => resolve(null), timeout)),
+])"""
+
+
+def find_first_visible(page, targets):
+    """
+    Probe every target in one round trip and mark the first visible match.
+
+    Args:
+        targets (list): (css selector, text or None) pairs in order of preference; with a
+            text, the element must contain it (case-insensitive), like :has-text()
+
+    Returns:
+        int: Index of the matching target (click it with page.locator(TARGET_SELECTOR)), or None
+    """
+    index = page.evaluate(_FIND_FIRST_VISIBLE, [[list(target) for target in targets], TARGET_ATTRIBUTE])
+    return index if index >= 0 else None
+
+
+def wait_for_change(page, trigger=None, url_part=None, timeout=5000, mutations=True):
+    """
+    Run `trigger()` and wait until the page reacts, instead of sleeping a fixed time.
+
+    Completes on the first DOM mutation or finished request whose URL contains
+    `url_part`, whichever comes first. With mutations=False only the request counts,
+    for callers that must not mistake a spinner for the results arriving.
+
+    Returns:
+        str: "mutation", "response", "navigation" if the page navigated away, or None
+            if nothing happened within `timeout` milliseconds
+    """
+    try:
+        page.evaluate(_ARM_CHANGE, [url_part, mutations])
+        if trigger is not None:
+            trigger()
+        return page.evaluate(_AWAIT_CHANGE, timeout)
+    except Exception as e:
+        # The page navigated and took the observers with it
+        if "context was destroyed" in str(e) or "navigation" in str(e).lower():
+            return "navigation"
+        raise
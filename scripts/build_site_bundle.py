@@ -0,0 +1,155 @@
+"""
+Build the compact data bundle the dashboard loads.
+Only the columns the table shows are kept, live jobs are split into a small "recent"
+shard per company plus fixed-size archive shards, and every shard is written with
+precompressed .gz (and .br when the brotli package is installed) variants. A manifest
+lists the shards with their counts so the page can render the recent shards first and
+stream in the rest. The search index (see search_index.py) is built over the same rows.
+
+Every company with an archive in jobs/ is included, so a source added through config
+alone shows up on the site once it has been scraped.
+
+Usage:
+    python build_site_bundle.py [output_dir]
+"""
+
+import glob
+import gzip
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from columnar_store import COLUMNAR_SUFFIX
+from job_history import ARCHIVE_SUFFIX, company_for
+from job_store import load_existing_jobs, record_key
+from search_index import build_index
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+JOBS_DIR = os.path.join(SCRIPT_DIR, "..", "jobs")
+DEFAULT_OUTPUT_DIR = os.path.join(JOBS_DIR, "site")
+
+# Columns the dashboard table shows, in the order rows are stored
+BUNDLE_COLUMNS = ["Title", "Location", "Posted Date", "Job URL"]
+
+RECENT_DAYS = 7
+SHARD_ROWS = 1000
+
+
+def archive_companies(jobs_dir=JOBS_DIR):
+    """Every company with a JSON or columnar archive in `jobs_dir`, sorted."""
+    columnar_suffix = ARCHIVE_SUFFIX[:-len(".json")] + COLUMNAR_SUFFIX
+    paths = glob.glob(os.path.join(jobs_dir, f"*{ARCHIVE_SUFFIX}"))
+    companies = {company_for(path) for path in paths}
+    companies.update(os.path.basename(path)[:-len(columnar_suffix)]
+                     for path in glob.glob(os.path.join(jobs_dir, f"*{columnar_suffix}")))
+    return sorted(companies)
+
+
+def job_date(job):
+    """Posted Date when the source gives a normalized one, otherwise when we first saw the job."""
+    posted = job.get("Posted Date") or ""
+    if posted[:4].isdigit() and posted.endswith("Z"):
+        return posted
+    return job.get("First Seen") or job.get("Scraped At") or ""
+
+
+def last_updated(jobs_by_company):
+    """When the data last changed: the most recent First Seen among the live jobs."""
+    timestamps = [
+        job.get("First Seen") or job.get("Scraped At") or ""
+        for jobs in jobs_by_company.values() for job in jobs
+    ]
+    return max(timestamps, default="") or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def write_shard(output_dir, name, rows):
+    """Write one shard as minified JSON plus its precompressed variants; return its size info."""
+    data = json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    path = os.path.join(output_dir, name)
+    with open(path, "wb") as f:
+        f.write(data)
+
+    # mtime=0 keeps the gzip output byte-identical across runs with unchanged data
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    sizes = {"bytes": len(data), "gz_bytes": os.path.getsize(path + ".gz")}
+
+    if brotli is not None:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(data, quality=11))
+        sizes["br_bytes"] = os.path.getsize(path + ".br")
+    return sizes
+
+
+def build_bundle(output_dir=DEFAULT_OUTPUT_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    jobs_by_company = {}
+    for company in archive_companies():
+        jobs = load_existing_jobs(os.path.join(JOBS_DIR, f"{company}_jobs_processed.json"))
+        # Older archives can still hold a job twice; keep the last copy, as JobStore does
+        live = {record_key(job): job for job in jobs if not job.get("Removed At")}
+        jobs_by_company[company] = list(live.values())
+
+    updated = last_updated(jobs_by_company)
+    cutoff = (datetime.strptime(updated[:10], "%Y-%m-%d") - timedelta(days=RECENT_DAYS)).strftime("%Y-%m-%d")
+
+    recent_shards = []
+    archive_shards = []
+    shard_jobs = {}
+    companies = {}
+    for company, jobs in jobs_by_company.items():
+        jobs = sorted(jobs, key=job_date, reverse=True)
+        recent = [job for job in jobs if job_date(job) >= cutoff]
+        older = jobs[len(recent):]
+        companies[company] = {"count": len(jobs), "recent": len(recent)}
+
+        groups = [("recent", 0, recent)] + [
+            ("archive", index, older[start:start + SHARD_ROWS])
+            for index, start in enumerate(range(0, len(older), SHARD_ROWS))
+        ]
+        for recency, index, group in groups:
+            if not group:
+                continue
+            name = f"{company}-{recency}.json" if recency == "recent" else f"{company}-{recency}-{index}.json"
+            rows = [[job.get(column) or "" for column in BUNDLE_COLUMNS] for job in group]
+            shard = {"file": name, "company": company, "recency": recency, "count": len(rows)}
+            shard.update(write_shard(output_dir, name, rows))
+            (recent_shards if recency == "recent" else archive_shards).append(shard)
+            shard_jobs[name] = [dict(job, company=company) for job in group]
+
+    # Document IDs for the search index are positions in the final shard order
+    shards = recent_shards + archive_shards
+    docs = []
+    for shard in shards:
+        shard["offset"] = len(docs)
+        docs.extend(shard_jobs[shard["file"]])
+    index_sizes = write_shard(output_dir, "search-index.json", build_index(docs))
+
+    manifest = {
+        "version": 1,
+        "last_updated": updated,
+        "columns": BUNDLE_COLUMNS,
+        "total": sum(info["count"] for info in companies.values()),
+        "companies": companies,
+        # Recent shards come first so the page can render them before the archive arrives
+        "shards": shards,
+        "search_index": dict(file="search-index.json", **index_sizes),
+    }
+    with open(os.path.join(output_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"Wrote {len(shards)} shards with {manifest['total']} live jobs to {output_dir}")
+    print(f"  - Raw: {sum(s['bytes'] for s in shards):,} bytes, gzip: {sum(s['gz_bytes'] for s in shards):,} bytes")
+    print(f"  - Search index: {index_sizes['bytes']:,} bytes, gzip: {index_sizes['gz_bytes']:,} bytes")
+    if brotli is None:
+        print("  - brotli not installed, skipped .br variants")
+    return manifest
+
+
+if __name__ == "__main__":
+    build_bundle(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_OUTPUT_DIR)
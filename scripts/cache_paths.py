@@ -0,0 +1,15 @@
+"""
+Location of the .cache/ directory shared by the HTTP cache and the job store's
+last-seen sidecars. Kept free of third-party imports so the site build, which only
+reads job files, does not need the scraper dependencies.
+"""
+
+import os
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(SCRIPT_DIR, "..", ".cache")
+CACHE_DIR_ENV_VAR = "JOBS_SCRAPER_CACHE_DIR"
+
+
+def cache_dir():
+    return os.environ.get(CACHE_DIR_ENV_VAR) or DEFAULT_CACHE_DIR
@@ -0,0 +1,322 @@
+"""
+Compact columnar on-disk format for processed job files.
+Rows are stored column by column in a gzip-compressed JSON container. Each column
+picks the cheapest encoding that round-trips exactly:
+
+- derived:   the value is a constant prefix/suffix around another column (Job URL, Requisition ID)
+- int-delta: digit-only IDs stored as delta-encoded integers
+- timestamp: UTC ISO timestamps stored as delta-encoded epoch seconds
+- dict:      low-cardinality values (Location, Department, Title...) stored once plus integer codes
+- prefix:    strings sharing a long common prefix stored without it
+- plain:     everything else, as-is
+
+Key order and missing keys are preserved through a small dictionary of row schemas,
+so `read_columnar(write_columnar(rows))` returns exactly the original rows.
+
+Usage:
+    python columnar_store.py pack ../jobs/nvidia_jobs_processed.json
+    python columnar_store.py export ../jobs/nvidia_jobs_processed.columnar.json.gz
+    python columnar_store.py export-all ../jobs
+"""
+
+import calendar
+import glob
+import gzip
+import json
+import os
+import sys
+import time
+from json_stream import atomic_write, write_json_array
+
+FORMAT_VERSION = 1
+COLUMNAR_SUFFIX = ".columnar.json.gz"
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Dictionary-encode a column when it has at most this fraction of distinct values
+DICT_MAX_CARDINALITY = 0.5
+MIN_PREFIX_LENGTH = 8
+
+
+def columnar_path(json_path):
+    """Map jobs/x_jobs_processed.json to jobs/x_jobs_processed.columnar.json.gz."""
+    base = json_path[:-len(".json")] if json_path.endswith(".json") else json_path
+    return base + COLUMNAR_SUFFIX
+
+
+def json_path_for(columnar_file):
+    return columnar_file[:-len(COLUMNAR_SUFFIX)] + ".json"
+
+
+# --- encoders -----------------------------------------------------------------
+
+def _delta(values):
+    previous = 0
+    deltas = []
+    for value in values:
+        deltas.append(value - previous)
+        previous = value
+    return deltas
+
+
+def _undelta(deltas):
+    total = 0
+    values = []
+    for delta in deltas:
+        total += delta
+        values.append(total)
+    return values
+
+
+def _try_int_delta(values):
+    if not values or not all(isinstance(v, str) and v.isdigit() and v.isascii() for v in values):
+        return None
+    width = len(values[0])
+    if all(str(int(v)) == v for v in values):
+        return {"encoding": "int-delta", "values": _delta([int(v) for v in values])}
+    # Zero-padded IDs (e.g. Accenture's "00349359") round-trip only if they share one width
+    if all(len(v) == width for v in values):
+        return {"encoding": "int-delta", "pad": width, "values": _delta([int(v) for v in values])}
+    return None
+
+
+def _parse_timestamp(value):
+    try:
+        seconds = calendar.timegm(time.strptime(value, TIMESTAMP_FORMAT))
+    except (TypeError, ValueError):
+        return None
+    return seconds if time.strftime(TIMESTAMP_FORMAT, time.gmtime(seconds)) == value else None
+
+
+def _try_timestamp(values):
+    if not values or not all(isinstance(v, str) for v in values):
+        return None
+    seconds = []
+    previous = 0
+    saw_timestamp = False
+    for value in values:
+        if value == "":
+            seconds.append(None)
+            continue
+        parsed = _parse_timestamp(value)
+        if parsed is None:
+            return None
+        seconds.append(parsed - previous)
+        previous = parsed
+        saw_timestamp = True
+    return {"encoding": "timestamp", "values": seconds} if saw_timestamp else None
+
+
+def _is_scalar(value):
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _try_dict(values):
+    if not values or not all(_is_scalar(v) for v in values):
+        return None
+    dictionary = {}
+    codes = []
+    for value in values:
+        # bool and int compare equal in a dict, so key on the type as well
+        key = (type(value).__name__, value)
+        code = dictionary.get(key)
+        if code is None:
+            code = dictionary[key] = len(dictionary)
+        codes.append(code)
+    if len(dictionary) > max(1, len(values) * DICT_MAX_CARDINALITY):
+        return None
+    return {"encoding": "dict", "dictionary": [value for _, value in dictionary], "codes": codes}
+
+
+def _try_prefix(values):
+    if not values or not all(isinstance(v, str) for v in values):
+        return None
+    prefix = os.path.commonprefix(values)
+    if len(prefix) < MIN_PREFIX_LENGTH:
+        return None
+    return {"encoding": "prefix", "prefix": prefix, "values": [v[len(prefix):] for v in values]}
+
+
+def _try_derived(name, rows, present, columns):
+    """
+    Find an earlier stored column such that this column == prefix + source + suffix on
+    every row. Sources are limited to already-encoded, non-derived columns so decoding
+    never has to follow a chain.
+    """
+    sample = next((row for row, has in zip(rows, present[name]) if has), None)
+    if sample is None or not isinstance(sample[name], str):
+        return None
+    for source, source_present in present.items():
+        if source not in columns or columns[source]["encoding"] == "derived":
+            continue
+        if source_present != present[name]:
+            continue
+        source_value = sample[source]
+        if not isinstance(source_value, str) or not source_value or source_value not in sample[name]:
+            continue
+        start = sample[name].index(source_value)
+        prefix = sample[name][:start]
+        suffix = sample[name][start + len(source_value):]
+        if all(
+            isinstance(row[source], str) and row[name] == f"{prefix}{row[source]}{suffix}"
+            for row, has in zip(rows, present[name]) if has
+        ):
+            return {"encoding": "derived", "source": source, "prefix": prefix, "suffix": suffix}
+    return None
+
+
+def encode_column(values):
+    for encoder in (_try_int_delta, _try_timestamp, _try_dict, _try_prefix):
+        encoded = encoder(values)
+        if encoded is not None:
+            return encoded
+    return {"encoding": "plain", "values": values}
+
+
+# --- decoders -----------------------------------------------------------------
+
+def decode_column(column):
+    encoding = column["encoding"]
+    if encoding == "int-delta":
+        pad = column.get("pad")
+        return [str(v).zfill(pad) if pad else str(v) for v in _undelta(column["values"])]
+    if encoding == "timestamp":
+        values = []
+        previous = 0
+        for delta in column["values"]:
+            if delta is None:
+                values.append("")
+                continue
+            previous += delta
+            values.append(time.strftime(TIMESTAMP_FORMAT, time.gmtime(previous)))
+        return values
+    if encoding == "dict":
+        dictionary = column["dictionary"]
+        return [dictionary[code] for code in column["codes"]]
+    if encoding == "prefix":
+        prefix = column["prefix"]
+        return [prefix + v for v in column["values"]]
+    if encoding == "plain":
+        return column["values"]
+    raise ValueError(f"Unknown column encoding: {encoding}")
+
+
+# --- public API ---------------------------------------------------------------
+
+def encode_records(records):
+    """Encode a list of job dicts into the columnar container (a plain dict)."""
+    schemas = {}
+    row_schemas = []
+    for record in records:
+        schema = tuple(record.keys())
+        code = schemas.get(schema)
+        if code is None:
+            code = schemas[schema] = len(schemas)
+        row_schemas.append(code)
+
+    names = list(dict.fromkeys(name for schema in schemas for name in schema))
+    present = {name: [name in record for record in records] for name in names}
+
+    columns = {}
+    for name in names:
+        derived = _try_derived(name, records, present, columns)
+        if derived is not None:
+            columns[name] = derived
+            continue
+        values = [record[name] for record, has in zip(records, present[name]) if has]
+        columns[name] = encode_column(values)
+
+    return {
+        "format": "jobs-columnar",
+        "version": FORMAT_VERSION,
+        "count": len(records),
+        "schemas": [list(schema) for schema in schemas],
+        "row_schemas": encode_column([str(code) for code in row_schemas]),
+        "columns": columns,
+    }
+
+
+def decode_records(container):
+    """Rebuild the list of job dicts from a columnar container."""
+    if container.get("format") != "jobs-columnar":
+        raise ValueError("Not a jobs-columnar container")
+    if container.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar format version: {container.get('version')}")
+
+    schemas = container["schemas"]
+    row_schemas = [int(code) for code in decode_column(container["row_schemas"])]
+    columns = container["columns"]
+
+    # Decode stored columns first; derived columns are rebuilt per row from their source
+    decoded = {name: iter(decode_column(column)) for name, column in columns.items() if column["encoding"] != "derived"}
+    derived = {name: column for name, column in columns.items() if column["encoding"] == "derived"}
+
+    records = []
+    for code in row_schemas:
+        record = {}
+        schema = schemas[code]
+        for name in schema:
+            if name not in derived:
+                record[name] = next(decoded[name])
+        for name in schema:
+            column = derived.get(name)
+            if column is not None:
+                record[name] = f"{column['prefix']}{record[column['source']]}{column['suffix']}"
+        # Restore the original key order
+        records.append({name: record[name] for name in schema})
+    return records
+
+
+def write_columnar(records, path):
+    """Write job records to `path` in the gzip-compressed columnar format."""
+    data = json.dumps(encode_records(records), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    with atomic_write(path, "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+
+
+def read_columnar(path):
+    """Load job records from a columnar file."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return decode_records(json.load(f))
+
+
+def export_json(columnar_file, json_file=None):
+    """Compatibility exporter: regenerate today's JSON array file from a columnar file."""
+    json_file = json_file or json_path_for(columnar_file)
+    records = read_columnar(columnar_file)
+    write_json_array(json_file, records)
+    print(f"Exported {len(records)} jobs to {json_file}")
+    return json_file
+
+
+def pack_json(json_file, columnar_file=None):
+    """Convert an existing processed JSON file into the columnar format."""
+    columnar_file = columnar_file or columnar_path(json_file)
+    with open(json_file, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    write_columnar(records, columnar_file)
+    before = os.path.getsize(json_file)
+    after = os.path.getsize(columnar_file)
+    print(f"Packed {len(records)} jobs: {json_file} ({before:,} bytes) -> {columnar_file} ({after:,} bytes)")
+    return columnar_file
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ("pack", "export", "export-all"):
+        print(__doc__)
+        sys.exit(1)
+
+    command, targets = sys.argv[1], sys.argv[2:]
+    if command == "pack":
+        for target in targets:
+            pack_json(target)
+    elif command == "export":
+        for target in targets:
+            export_json(target)
+    else:
+        for jobs_dir in targets:
+            for columnar_file in sorted(glob.glob(os.path.join(jobs_dir, f"*{COLUMNAR_SUFFIX}"))):
+                export_json(columnar_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,83 @@ Converts various date formats to UTC ISO format (YYYY-MM-DDTHH:MM:SSZ).
 
 import re
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from dateutil import parser
+from log_utils import get_logger
 
+log = get_logger("date_utils")
 
-def normalize_date_to_utc(date_string):
+# One pass over the string recognizes every relative "Posted ..." form
+RELATIVE_DATE_PATTERN = re.compile(
+    r'posted\s+(?:(?P<today>today)|(?P<yesterday>yesterday)|(?P<count>\d+)\+?\s+(?P<unit>hour|day|week|month)s?\s+ago)',
+    re.IGNORECASE,
+)
+POSTED_PREFIX_PATTERN = re.compile(r'^posted\s+', re.IGNORECASE)
+
+# Fixed formats tried with strptime before falling back to dateutil
+FAST_DATE_FORMATS = (
+    '%Y-%m-%dT%H:%M:%SZ',
+    '%Y-%m-%d',
+    '%b %d, %Y',
+    '%B %d, %Y',
+    '%Y-%m-%d %H:%M:%S',
+    '%d %b %Y',
+)
+
+UNIT_DAYS = {"day": 1, "week": 7, "month": 30}
+
+
+def _parse_absolute_date(date_string):
+    # Remove "Posted" prefix if present
+    clean_date = POSTED_PREFIX_PATTERN.sub('', date_string).strip()
+
+    for date_format in FAST_DATE_FORMATS:
+        try:
+            return datetime.strptime(clean_date, date_format).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+
+    parsed_date = parser.parse(clean_date)
+
+    # If no timezone info, treat it as UTC
+    if parsed_date.tzinfo is None:
+        return parsed_date.replace(tzinfo=timezone.utc)
+    # Convert to UTC if timezone is specified
+    return parsed_date.astimezone(timezone.utc)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_for_day(date_string, today):
+    """
+    Normalize a date string that only depends on the reference day, not the time of day.
+    Cached on (string, day) because sources repeat a handful of strings across thousands of jobs.
+    """
+    try:
+        match = RELATIVE_DATE_PATTERN.search(date_string)
+        if match and match.group("today"):
+            result_date = today
+        elif match and match.group("yesterday"):
+            result_date = today - timedelta(days=1)
+        elif match:
+            result_date = today - timedelta(days=int(match.group("count")) * UNIT_DAYS[match.group("unit").lower()])
+        else:
+            result_date = _parse_absolute_date(date_string)
+
+        # Return in ISO format with Z suffix for UTC
+        return result_date.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    except Exception as e:
+        log.warning("[Warning] Failed to parse date %r: %s", date_string, e)
+        return ""
+
+
+def normalize_date_to_utc(date_string, now=None):
     """
     Convert various date formats to standardized UTC ISO format.
     
     Args:
         date_string (str): Date string in various formats
+        now (datetime): Reference time for relative dates (defaults to the current UTC time)
         
     Returns:
         str: UTC ISO formatted date string (YYYY-MM-DDTHH:MM:SSZ) or empty string if parsing fails
@@ -22,67 +90,41 @@ def normalize_date_to_utc(date_string):
         return ""
     
     # Get current UTC time
-    now_utc = datetime.now(timezone.utc)
+    now_utc = now or datetime.now(timezone.utc)
     
     # Clean the input string
     date_string = date_string.strip()
     
-    try:
-        # Handle relative dates like "Posted Today", "Posted Yesterday", "Posted X Days Ago"
-        if re.search(r'posted\s+today', date_string, re.IGNORECASE):
-            # Posted today - use current date at midnight UTC
-            result_date = now_utc.replace(hour=0, minute=0, second=0, microsecond=0)
-            
-        elif re.search(r'posted\s+yesterday', date_string, re.IGNORECASE):
-            # Posted yesterday
-            result_date = (now_utc - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-            
-        elif re.search(r'posted\s+(\d+)\s+days?\s+ago', date_string, re.IGNORECASE):
-            # Posted X days ago
-            match = re.search(r'posted\s+(\d+)\s+days?\s+ago', date_string, re.IGNORECASE)
-            days_ago = int(match.group(1))
-            result_date = (now_utc - timedelta(days=days_ago)).replace(hour=0, minute=0, second=0, microsecond=0)
-            
-        elif re.search(r'posted\s+(\d+)\s+hours?\s+ago', date_string, re.IGNORECASE):
-            # Posted X hours ago
-            match = re.search(r'posted\s+(\d+)\s+hours?\s+ago', date_string, re.IGNORECASE)
-            hours_ago = int(match.group(1))
-            result_date = now_utc - timedelta(hours=hours_ago)
-            
-        elif re.search(r'posted\s+(\d+)\s+weeks?\s+ago', date_string, re.IGNORECASE):
-            # Posted X weeks ago
-            match = re.search(r'posted\s+(\d+)\s+weeks?\s+ago', date_string, re.IGNORECASE)
-            weeks_ago = int(match.group(1))
-            result_date = (now_utc - timedelta(weeks=weeks_ago)).replace(hour=0, minute=0, second=0, microsecond=0)
-            
-        elif re.search(r'posted\s+(\d+)\s+months?\s+ago', date_string, re.IGNORECASE):
-            # Posted X months ago (approximate)
-            match = re.search(r'posted\s+(\d+)\s+months?\s+ago', date_string, re.IGNORECASE)
-            months_ago = int(match.group(1))
-            result_date = (now_utc - timedelta(days=months_ago * 30)).replace(hour=0, minute=0, second=0, microsecond=0)
-            
-        else:
-            # Try to parse as regular date using dateutil parser
-            # Remove "Posted" prefix if present
-            clean_date = re.sub(r'^posted\s+', '', date_string, flags=re.IGNORECASE).strip()
-            
-            # Parse the date
-            parsed_date = parser.parse(clean_date)
-            
-            # If no timezone info, assume it's in the local timezone and convert to UTC
-            if parsed_date.tzinfo is None:
-                # Assume local time and convert to UTC (using system timezone)
-                result_date = parsed_date.replace(tzinfo=timezone.utc)
-            else:
-                # Convert to UTC if timezone is specified
-                result_date = parsed_date.astimezone(timezone.utc)
-        
-        # Return in ISO format with Z suffix for UTC
+    # "Posted X hours ago" depends on the time of day, so it is the one form that is not cached
+    match = RELATIVE_DATE_PATTERN.search(date_string)
+    if match and match.group("unit") and match.group("unit").lower() == "hour":
+        result_date = now_utc - timedelta(hours=int(match.group("count")))
         return result_date.strftime('%Y-%m-%dT%H:%M:%SZ')
+    
+    today = now_utc.replace(hour=0, minute=0, second=0, microsecond=0)
+    return _normalize_for_day(date_string, today)
+
+
+def normalize_dates(date_strings, now=None):
+    """
+    Normalize a whole column of date strings against one reference time.
+    
+    Args:
+        date_strings (iterable): Date strings in various formats
+        now (datetime): Reference time for relative dates (defaults to the current UTC time)
         
-    except Exception as e:
-        print(f"[Warning] Failed to parse date '{date_string}': {e}")
-        return ""
+    Returns:
+        list: UTC ISO formatted date strings, empty where parsing fails
+    """
+    now_utc = now or datetime.now(timezone.utc)
+    normalized = {}
+    results = []
+    for date_string in date_strings:
+        key = date_string if isinstance(date_string, str) else None
+        if key not in normalized:
+            normalized[key] = normalize_date_to_utc(date_string, now_utc)
+        results.append(normalized[key])
+    return results
 
 
 def get_current_utc_timestamp():
@@ -97,7 +139,8 @@ def get_current_utc_timestamp():
 
 def add_scrape_metadata(job_entry):
     """
-    Add metadata about when the job was scraped.
+    Normalize the job's Posted Date, keeping the source's text as Posted Date Original.
+    When the job was scraped is tracked by JobStore (First Seen / Last Seen), not here.
     
     Args:
         job_entry (dict): Job entry dictionary
@@ -105,8 +148,6 @@ def add_scrape_metadata(job_entry):
     Returns:
         dict: Job entry with added scrape metadata
     """
-    job_entry["Scraped At"] = get_current_utc_timestamp()
-    
     # Normalize the Posted Date if it exists (including empty strings)
     if "Posted Date" in job_entry:
         original_date = job_entry["Posted Date"]
@@ -126,6 +167,33 @@ def add_scrape_metadata(job_entry):
     return job_entry
 
 
+def add_scrape_metadata_batch(job_entries):
+    """
+    Add scrape metadata to a list of job entries, normalizing the Posted Date column at once.
+    
+    Args:
+        job_entries (list): Job entry dictionaries
+        
+    Returns:
+        list: The same job entries with added scrape metadata
+    """
+    now_utc = datetime.now(timezone.utc)
+    dated = [job for job in job_entries if "Posted Date" in job]
+    normalized = normalize_dates(
+        [job["Posted Date"] if job["Posted Date"] and job["Posted Date"].strip() else "" for job in dated],
+        now_utc,
+    )
+    
+    for job_entry, normalized_date in zip(dated, normalized):
+        original_date = job_entry["Posted Date"]
+        job_entry["Posted Date Original"] = original_date
+        # Leave empty dates as they are
+        if original_date and original_date.strip():
+            job_entry["Posted Date"] = normalized_date
+    
+    return job_entries
+
+
 # Test function for debugging
 def test_date_normalization():
     """Test the date normalization function with various inputs."""
@@ -133,6 +201,8 @@ def test_date_normalization():
         "Posted Today",
         "Posted Yesterday", 
         "Posted 2 Days Ago",
+        "Posted 30+ Days Ago",
+        "Posted 5 hours ago",
         "Posted 1 week ago",
         "Posted 3 months ago",
         "Jun 29, 2025",
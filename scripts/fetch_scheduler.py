@@ -0,0 +1,239 @@
+"""
+Shared fetch scheduler for all scrapers.
+Every outgoing request goes through a per-host token bucket and a global cap on
+in-flight requests, and is retried with exponential backoff and jitter when a site
+answers 429/5xx. Pacing then follows the site's actual limits instead of fixed sleeps.
+GET and POST requests are revalidated against the on-disk HTTP cache (see http_cache),
+so an unchanged page costs one 304 round-trip. Requests are recorded or sent to a local
+replay server when replay.py is active.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from http_cache import HttpCache
+import metrics
+import replay
+from log_utils import get_logger
+
+log = get_logger("fetch_scheduler")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Requests per second allowed per host; hosts not listed use the scheduler default
+DEFAULT_HOST_RATES = {
+    "jobs.apple.com": 4.0,
+    "www.tesla.com": 1.0,
+    "www.metacareers.com": 1.0,
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose rate adapts to throttling responses."""
+
+    def __init__(self, rate, burst):
+        self.max_rate = rate
+        self.min_rate = rate / 16
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def slow_down(self):
+        """Halve the rate after the host signals it is overloaded."""
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def speed_up(self):
+        """Recover the rate gradually after successful requests."""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+def parse_retry_after(value):
+    """Convert a Retry-After header (seconds or HTTP date) into seconds to wait."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class FetchScheduler:
+    """
+    Rate-limited, retrying HTTP fetcher shared by every scraper.
+
+    Args:
+        max_in_flight (int): Maximum number of concurrent requests across all hosts
+        rate (float): Default requests per second per host
+        burst (int): Requests a host may receive back-to-back before pacing starts
+        max_retries (int): Retries for 429/5xx responses and connection errors
+        backoff_base (float): First backoff delay in seconds, doubled on each retry
+        backoff_cap (float): Upper bound for a single backoff delay in seconds
+        host_rates (dict): Per-host overrides of `rate`
+        cache (HttpCache): Response cache for conditional requests, or None to disable
+    """
+
+    def __init__(self, max_in_flight=8, rate=5.0, burst=5, max_retries=4,
+                 backoff_base=1.0, backoff_cap=60.0, host_rates=None, timeout=30, cache=None):
+        self.max_in_flight = max_in_flight
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.host_rates = dict(DEFAULT_HOST_RATES)
+        self.host_rates.update(host_rates or {})
+        self.timeout = timeout
+        self.cache = cache
+
+        self.in_flight = threading.BoundedSemaphore(max_in_flight)
+        self.buckets = {}
+        self.buckets_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max_in_flight)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def bucket_for(self, url):
+        host = urlsplit(url).netloc
+        with self.buckets_lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                rate = self.host_rates.get(host, self.rate)
+                bucket = TokenBucket(rate, min(self.burst, max(1, int(rate))))
+                self.buckets[host] = bucket
+            return bucket
+
+    def throttle(self, url):
+        """Wait for the host's next request slot without sending anything (used by browser loops)."""
+        self.bucket_for(url).acquire()
+
+    def backoff_delay(self, attempt):
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request through the host's rate limiter, retrying on throttling and errors.
+
+        When the cache holds an earlier response for the same request, its validators are
+        sent along and a 304 answer is replaced by the cached body.
+
+        Returns:
+            requests.Response: The final response (which may still be an error status)
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        cache_key = entry = None
+        if self.cache is not None and method in ("GET", "POST") and not kwargs.get("stream"):
+            cache_key = self.cache.key(method, url, kwargs.get("params"), kwargs.get("json"), kwargs.get("data"))
+            entry = self.cache.lookup(cache_key)
+            if entry is not None:
+                kwargs["headers"] = {**(kwargs.get("headers") or {}), **self.cache.conditional_headers(entry)}
+        bucket = self.bucket_for(url)
+        send_url = replay.replay_url(url)
+        attempt = 0
+        while True:
+            bucket.acquire()
+            host = urlsplit(url).netloc
+            started = time.perf_counter()
+            try:
+                with self.in_flight:
+                    response = self.session.request(method, send_url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                metrics.count("http_errors", host=host)
+                if attempt >= self.max_retries:
+                    raise
+                metrics.count("http_retries", host=host)
+                delay = self.backoff_delay(attempt)
+                log.warning("[!] %s %s failed (%s), retrying in %.1fs", method, url, e, delay)
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            metrics.observe("request_seconds", time.perf_counter() - started, host=host)
+            metrics.count("http_requests", host=host, status=str(response.status_code))
+            if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                if response.status_code < 400:
+                    bucket.speed_up()
+                if cache_key is not None:
+                    response = self.cache.resolve(cache_key, entry, response)
+                if metrics.enabled() and not kwargs.get("stream"):
+                    metrics.count("http_bytes", len(response.content), host=host)
+                    if response.status_code < 400:
+                        metrics.count("pages")
+                    if getattr(response, "from_cache", False):
+                        metrics.count("cache_hits", host=host)
+                replay.record_response(response)
+                return response
+
+            bucket.slow_down()
+            metrics.count("http_retries", host=host)
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            delay = retry_after if retry_after is not None else self.backoff_delay(attempt)
+            delay = min(delay, self.backoff_cap)
+            log.warning("[!] %s %s returned %s, retrying in %.1fs", method, url, response.status_code, delay)
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    async def arequest(self, method, url, **kwargs):
+        """Async variant of `request` for asyncio-based scrapers."""
+        return await asyncio.to_thread(self.request, method, url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_default_scheduler = None
+_default_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the process-wide scheduler so every scraper shares one pool and one set of limits."""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            # Recordings must hold full bodies, and replays must not touch the real cache
+            cache = None if replay.active() else HttpCache.from_env()
+            _default_scheduler = FetchScheduler(cache=cache)
+        return _default_scheduler
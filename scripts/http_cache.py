@@ -0,0 +1,199 @@
+"""
+On-disk HTTP response cache shared by every scraper.
+The fetch scheduler stores each response's validators (ETag / Last-Modified) and body,
+sends If-None-Match / If-Modified-Since on the next run and serves the stored body when
+the server answers 304 Not Modified. Entries expire after a TTL, and the least recently
+used entries are evicted once the cache exceeds its size limit.
+
+Payload digests let a scraper skip its processing stage entirely when the listings it
+fetched are byte-identical to the previous run's.
+
+The cache lives in .cache/ at the repository root (JOBS_SCRAPER_CACHE_DIR overrides it)
+and is disabled with JOBS_SCRAPER_NO_CACHE=1.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+from cache_paths import cache_dir
+from json_stream import atomic_write
+from log_utils import get_logger
+
+log = get_logger("http_cache")
+
+NO_CACHE_ENV_VAR = "JOBS_SCRAPER_NO_CACHE"
+
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Response headers kept with a cached body
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+def cache_enabled():
+    return os.environ.get(NO_CACHE_ENV_VAR, "").lower() not in ("1", "true", "yes")
+
+
+def content_hash(data):
+    """SHA-256 of raw bytes, or of the canonical JSON form of any other value."""
+    if not isinstance(data, bytes):
+        data = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class HttpCache:
+    """Validators and bodies of earlier responses, keyed by method, URL and request body."""
+
+    def __init__(self, directory, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = os.path.join(directory, "http")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.evicted = False
+        os.makedirs(self.directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        """The cache configured by the environment, or None when caching is disabled."""
+        return cls(cache_dir()) if cache_enabled() else None
+
+    @staticmethod
+    def key(method, url, params=None, json_body=None, data=None):
+        request_id = json.dumps([method, url, params, json_body, data], sort_keys=True, default=str)
+        return hashlib.sha256(request_id.encode("utf-8")).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + ".json", base + ".body"
+
+    def lookup(self, key):
+        """Return the stored entry for `key`, or None if it is missing or expired."""
+        self.evict()
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if time.time() - entry["stored_at"] > self.ttl:
+                return None
+            with open(body_path, "rb") as f:
+                entry["body"] = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+        # Touch the entry so eviction is least-recently-used
+        os.utime(meta_path)
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key, response):
+        meta_path, body_path = self._paths(key)
+        body = response.content
+        entry = {
+            "url": response.url,
+            "stored_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "headers": {name: response.headers[name] for name in STORED_HEADERS if name in response.headers},
+            "body_hash": content_hash(body),
+        }
+        with atomic_write(body_path, "wb") as f:
+            f.write(body)
+        with atomic_write(meta_path) as f:
+            json.dump(entry, f)
+
+    @staticmethod
+    def cached_response(entry, url):
+        """Rebuild a 200 response from a stored entry (after the server answered 304)."""
+        response = requests.Response()
+        response.status_code = 200
+        response._content = entry["body"]
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        response.url = url
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+        return response
+
+    def resolve(self, key, entry, response):
+        """
+        Turn the network response into the one handed to the scraper: a 304 is answered
+        from the cache, a 200 is stored. Adds `from_cache` and `content_hash` attributes.
+        """
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            response = self.cached_response(entry, response.url)
+            response.from_cache = True
+            response.content_hash = entry["body_hash"]
+            return response
+
+        response.from_cache = False
+        if response.status_code == 200:
+            self.store(key, response)
+            response.content_hash = content_hash(response.content)
+        return response
+
+    def evict(self):
+        """Drop expired entries, then the least recently used ones until under the size limit (once per process)."""
+        with self.lock:
+            if self.evicted:
+                return
+            self.evicted = True
+
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            meta_path = os.path.join(self.directory, name)
+            body_path = meta_path[:-len(".json")] + ".body"
+            try:
+                used_at = os.path.getmtime(meta_path)
+                size = os.path.getsize(meta_path) + (os.path.getsize(body_path) if os.path.exists(body_path) else 0)
+            except OSError:
+                continue
+            entries.append((used_at, size, meta_path, body_path))
+
+        total = sum(size for _, size, _, _ in entries)
+        for used_at, size, meta_path, body_path in sorted(entries):
+            if now - used_at <= self.ttl and total <= self.max_bytes:
+                continue
+            for path in (meta_path, body_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= size
+
+
+def _digest_path(name):
+    return os.path.join(cache_dir(), "payloads", f"{name}.sha256")
+
+
+def process_if_changed(name, payload, process):
+    """
+    Run `process()` unless `payload` is identical to what `name` fetched on the last run.
+    The payload's digest is recorded only after `process()` succeeds.
+
+    Returns:
+        bool: True if the payload changed and was processed
+    """
+    digest = content_hash(payload)
+    path = _digest_path(name)
+    if cache_enabled() and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read().strip() == digest:
+                log.info("[*] %s: fetched listings are identical to the last run, skipping processing", name)
+                return False
+
+    process()
+    if cache_enabled():
+        with atomic_write(path) as f:
+            f.write(digest)
+    return True
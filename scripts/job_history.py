@@ -0,0 +1,250 @@
+"""
+Append-only change history for each company's job archive.
+Every time the processing stage saves an archive, the jobs it added, updated and
+removed are appended as events to jobs/history/<company>/events.jsonl. Every
+SNAPSHOT_INTERVAL_DAYS (or SNAPSHOT_MAX_EVENTS events) the live jobs are also written
+as a compacted columnar snapshot that records how far into the log it reaches.
+
+The state at any timestamp is rebuilt from the nearest earlier snapshot plus the
+log events after it, so a query never replays more than one snapshot interval.
+
+Usage:
+    python job_history.py nvidia --at 2026-01-31            # jobs open at the end of that day
+    python job_history.py nvidia --job 1998467              # when a job was open
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+from columnar_store import read_columnar, write_columnar
+from json_stream import atomic_write
+from log_utils import get_logger
+
+log = get_logger("job_history")
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_DIR = os.path.join(SCRIPT_DIR, "..", "jobs", "history")
+ARCHIVE_SUFFIX = "_jobs_processed.json"
+
+SNAPSHOT_INTERVAL_DAYS = 30
+SNAPSHOT_MAX_EVENTS = 20000
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def company_for(output_file):
+    """Company name of a processed archive path (../jobs/nvidia_jobs_processed.json -> nvidia)."""
+    name = os.path.basename(output_file)
+    return name[:-len(ARCHIVE_SUFFIX)] if name.endswith(ARCHIVE_SUFFIX) else os.path.splitext(name)[0]
+
+
+def to_timestamp(value):
+    """Accept a full UTC timestamp or a plain date, which means the end of that day."""
+    if len(value) == 10:
+        return f"{value}T23:59:59Z"
+    return value
+
+
+def key_of(record):
+    """The key job_store.record_key uses (job_store imports this module, not the other way round)."""
+    return record.get("Job ID") or record.get("Job URL") or ""
+
+
+def _days_between(start, end):
+    parse = lambda value: datetime.strptime(value, TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+    return (parse(end) - parse(start)).total_seconds() / 86400
+
+
+class JobHistory:
+    """One company's event log and snapshots."""
+
+    def __init__(self, company, history_dir=HISTORY_DIR):
+        self.company = company
+        self.directory = os.path.join(history_dir, company)
+        self.events_path = os.path.join(self.directory, "events.jsonl")
+        self.index_path = os.path.join(self.directory, "snapshots.json")
+        self.position_path = os.path.join(self.directory, "events.position.json")
+
+    @classmethod
+    def for_archive(cls, output_file):
+        """The history kept in a history/ directory beside the archive."""
+        return cls(company_for(output_file), os.path.join(os.path.dirname(output_file), "history"))
+
+    def snapshots(self):
+        """Snapshot index entries ({ts, file, offset, events}), oldest first."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _log_position(self):
+        """
+        Byte size and event count of the log. Both are stored beside it on every append,
+        so the log is only counted when that record is missing or out of date, and then
+        only from the last snapshot on.
+        """
+        if not os.path.exists(self.events_path):
+            return 0, 0
+        size = os.path.getsize(self.events_path)
+        try:
+            with open(self.position_path, "r", encoding="utf-8") as f:
+                position = json.load(f)
+            if position["offset"] == size:
+                return size, position["events"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        index = self.snapshots()
+        offset, event_count = (index[-1]["offset"], index[-1]["events"]) if index else (0, 0)
+        if offset > size:
+            offset = event_count = 0
+        with open(self.events_path, "rb") as f:
+            f.seek(offset)
+            event_count += sum(1 for _ in f)
+        self._save_position(size, event_count)
+        return size, event_count
+
+    def _save_position(self, offset, event_count):
+        with atomic_write(self.position_path) as f:
+            json.dump({"offset": offset, "events": event_count}, f)
+
+    def append(self, events):
+        if not events:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        offset, event_count = self._log_position()
+        data = "".join(json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n" for event in events)
+        data = data.encode("utf-8")
+        with open(self.events_path, "ab") as f:
+            f.write(data)
+        self._save_position(offset + len(data), event_count + len(events))
+
+    def snapshot(self, ts, live_records):
+        """Write the live jobs as of `ts`, pointing at the current end of the log."""
+        os.makedirs(os.path.join(self.directory, "snapshots"), exist_ok=True)
+        offset, event_count = self._log_position()
+        name = os.path.join("snapshots", ts.replace(":", "") + ".columnar.json.gz")
+        write_columnar(live_records, os.path.join(self.directory, name))
+
+        index = self.snapshots()
+        index.append({"ts": ts, "file": name, "offset": offset, "events": event_count})
+        with atomic_write(self.index_path) as f:
+            json.dump(index, f, indent=2)
+        log.info("[*] Wrote %s history snapshot with %s jobs", self.company, len(live_records))
+
+    def record(self, store):
+        """
+        Append a saved JobStore's changes to the log, writing a snapshot when the
+        history is new or the last snapshot is old or far behind the log.
+        """
+        index = self.snapshots()
+        if not index:
+            # Start the history from the current state rather than replaying it as events
+            self.snapshot(store.now, store.live_records())
+            return
+
+        events = [{"ts": store.now, "op": "added", "id": key_of(record), "record": record} for record in store.added]
+        events += [{"ts": store.now, "op": "updated", "id": key_of(record), "record": record} for record in store.updated]
+        events += [{"ts": store.now, "op": "removed", "id": key_of(record)} for record in store.removed]
+        self.append(events)
+
+        _, event_count = self._log_position()
+        last = index[-1]
+        if (_days_between(last["ts"], store.now) >= SNAPSHOT_INTERVAL_DAYS
+                or event_count - last["events"] >= SNAPSHOT_MAX_EVENTS):
+            self.snapshot(store.now, store.live_records())
+
+    def _events_from(self, offset):
+        if not os.path.exists(self.events_path):
+            return
+        with open(self.events_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                yield json.loads(line)
+
+    def state_at(self, ts):
+        """
+        Rebuild the jobs that were open at `ts`.
+
+        Returns:
+            dict: Job key -> record, or an empty dict if `ts` predates the history
+        """
+        ts = to_timestamp(ts)
+        base = None
+        for entry in self.snapshots():
+            if entry["ts"] > ts:
+                break
+            base = entry
+        if base is None:
+            return {}
+
+        state = {key_of(record): record for record in read_columnar(os.path.join(self.directory, base["file"]))}
+        # Events are appended in time order, so replay stops at the first one after `ts`
+        for event in self._events_from(base["offset"]):
+            if event["ts"] > ts:
+                break
+            if event["op"] == "removed":
+                state.pop(event["id"], None)
+            else:
+                state[event["id"]] = event["record"]
+        return state
+
+    def open_intervals(self, key):
+        """
+        When a job was open, as a list of (opened, closed) timestamps; `closed` is None
+        while the job is still open. Jobs open when the history started count from then.
+        """
+        intervals = []
+        opened = None
+        snapshots = self.snapshots()
+        if snapshots:
+            first = snapshots[0]
+            if any(key_of(record) == key for record in read_columnar(os.path.join(self.directory, first["file"]))):
+                opened = first["ts"]
+            start = first["offset"]
+        else:
+            start = 0
+
+        for event in self._events_from(start):
+            if event["id"] != key:
+                continue
+            if event["op"] == "removed" and opened is not None:
+                intervals.append((opened, event["ts"]))
+                opened = None
+            elif event["op"] != "removed" and opened is None:
+                opened = event["ts"]
+        if opened is not None:
+            intervals.append((opened, None))
+        return intervals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query a company's job history.")
+    parser.add_argument("company", help="Company name, e.g. nvidia")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--at", metavar="TIMESTAMP", help="Show the jobs open at a date or UTC timestamp")
+    group.add_argument("--job", metavar="JOB_ID", help="Show when a job was open")
+    args = parser.parse_args()
+
+    history = JobHistory(args.company)
+    if args.at:
+        state = history.state_at(args.at)
+        print(f"{len(state)} {args.company} jobs open at {to_timestamp(args.at)}")
+        for record in list(state.values())[:20]:
+            print(f"  - {record.get('Title', 'Unknown Title')} (ID: {key_of(record)})")
+        return
+
+    intervals = history.open_intervals(args.job)
+    if not intervals:
+        print(f"No history for job {args.job}")
+    for opened, closed in intervals:
+        if closed:
+            print(f"Open from {opened} to {closed} ({_days_between(opened, closed):.1f} days)")
+        else:
+            print(f"Open since {opened}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+"""
+Keyed storage for each company's job archive.
+JobStore indexes records by Job ID so merging a scrape into a large archive is a
+dictionary lookup per job, tracks when each job was first seen, last seen and removed,
+and collapses duplicate IDs.
+
+Each record carries a fingerprint of its substantive fields. A scraped job whose
+fingerprint matches the stored one leaves the stored record untouched, and an archive
+with no added, changed or removed jobs is not rewritten, so unchanged runs produce no
+diff. Every save also appends the changes to the company's history log (job_history.py).
+Scrape timestamps ("Last Seen") change every run and are kept in a sidecar under
+jobs/.last_seen/ instead of in the records.
+
+Incremental mode (set JOBS_SCRAPER_INCREMENTAL=1 or pass --incremental to run_all.py)
+stops pagination once a newest-first source returns a page of already-known jobs. The
+partial crawl is upserted into the archive without marking unseen jobs as removed.
+
+Set JOBS_STORAGE_FORMAT=columnar to keep archives in the compact columnar format
+(see columnar_store.py) instead of indented JSON arrays, or JOBS_STORAGE_FORMAT=sqlite
+to keep them in the shared SQLite database (see sqlite_store.py).
+"""
+
+import hashlib
+import json
+import os
+from cache_paths import cache_dir
+from columnar_store import columnar_path, read_columnar, write_columnar
+from date_utils import get_current_utc_timestamp
+from job_history import company_for, JobHistory
+from json_stream import atomic_write, iter_json_array, write_json_array
+import sqlite_store
+from log_utils import get_logger
+
+log = get_logger("job_store")
+
+INCREMENTAL_ENV_VAR = "JOBS_SCRAPER_INCREMENTAL"
+STORAGE_FORMAT_ENV_VAR = "JOBS_STORAGE_FORMAT"
+
+FINGERPRINT_FIELD = "Fingerprint"
+# Fields that change without the job itself changing, left out of the fingerprint.
+# Relative posted dates ("Posted 3 Days Ago") drift daily, so the stored Posted Date
+# of a known job is kept rather than re-derived on every run.
+UNTRACKED_FIELDS = frozenset([
+    FINGERPRINT_FIELD, "Scraped At", "Last Seen", "First Seen", "Removed At",
+    "Posted Date", "Posted Date Original",
+])
+# Per-run timestamps that older archives stored in every record
+SCRAPE_TIME_FIELDS = ("Scraped At", "Last Seen")
+LAST_SEEN_DIR = ".last_seen"
+
+
+def incremental_enabled():
+    """Return True when scrapers should only fetch listings newer than the stored ones."""
+    return os.environ.get(INCREMENTAL_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+
+def columnar_enabled():
+    """Return True when archives should be stored in the columnar format."""
+    return os.environ.get(STORAGE_FORMAT_ENV_VAR, "json").lower() == "columnar"
+
+
+def sqlite_enabled():
+    """Return True when archives should be stored in the SQLite database."""
+    return os.environ.get(STORAGE_FORMAT_ENV_VAR, "json").lower() == "sqlite"
+
+
+def load_sqlite_jobs(output_file):
+    """
+    Load a company's jobs from the database, importing its JSON archive on first use.
+
+    Returns:
+        tuple: (records, positions) with each job's stored position by key
+    """
+    company = company_for(output_file)
+    conn = sqlite_store.connect()
+    try:
+        if not sqlite_store.company_count(conn, company) and os.path.exists(output_file):
+            _, count = sqlite_store.import_json(conn, output_file)
+            log.info("Imported %s jobs from %s into %s", count, output_file, sqlite_store.db_path())
+        existing_jobs, positions = sqlite_store.load_company(conn, company)
+    finally:
+        conn.close()
+    log.info("Loaded %s existing %s jobs from %s", len(existing_jobs), company, sqlite_store.db_path())
+    return existing_jobs, positions
+
+
+def load_existing_jobs(output_file):
+    """Load existing jobs from the configured storage: the database, the columnar archive or the JSON file."""
+    if sqlite_enabled():
+        return load_sqlite_jobs(output_file)[0]
+
+    columnar_file = columnar_path(output_file)
+    if columnar_enabled() and os.path.exists(columnar_file):
+        try:
+            existing_jobs = read_columnar(columnar_file)
+            log.info("Loaded %s existing jobs from %s", len(existing_jobs), columnar_file)
+            return existing_jobs
+        except Exception as e:
+            log.warning("Warning: Could not load columnar jobs file: %s", e)
+
+    if os.path.exists(output_file):
+        try:
+            with open(output_file, "r", encoding="utf-8") as f:
+                existing_jobs = json.load(f)
+                log.info("Loaded %s existing jobs from %s", len(existing_jobs), output_file)
+                return existing_jobs
+        except Exception as e:
+            log.warning("Warning: Could not load existing jobs file: %s", e)
+            return []
+    else:
+        log.info("No existing jobs file found at %s", output_file)
+        return []
+
+
+def count_live_jobs(output_file):
+    """Count the live (not removed) jobs stored for an archive in the configured storage."""
+    if sqlite_enabled():
+        conn = sqlite_store.connect()
+        try:
+            return sqlite_store.live_count(conn, company_for(output_file))
+        finally:
+            conn.close()
+    if columnar_enabled():
+        jobs = read_columnar(columnar_path(output_file))
+    else:
+        jobs = iter_json_array(output_file)
+    return sum(1 for job in jobs if not job.get("Removed At"))
+
+
+def known_values(store, field="Job ID"):
+    """Collect the values of `field` across a loaded archive's jobs, for stop-early pagination."""
+    return {job.get(field) for job in store.records if job.get(field)}
+
+
+def page_is_known(page_ids, known):
+    """A page ends an incremental crawl when it is non-empty and every ID on it is already stored."""
+    page_ids = list(page_ids)
+    return bool(page_ids) and all(page_id in known for page_id in page_ids)
+
+
+async def crawl_pages(fetch_pages, pages, first_jobs, job_id, known=None, wave_size=8, label=""):
+    """
+    Fetch the pages after the first of a paginated listing and merge them with it.
+
+    Without `known`, every page is fetched at once. With the IDs already stored, pages
+    are fetched newest-first in waves of `wave_size`, and the crawl stops at the first
+    page made up entirely of known jobs.
+
+    Args:
+        fetch_pages: `async fetch_pages(pages)` returning one job list per page, or None
+            for a page that failed
+        first_jobs (list): Jobs on the first page, already fetched
+        job_id: `job_id(job)`, compared against `known` and used to drop repeats
+
+    Returns:
+        tuple: (jobs, complete) where `complete` is True only if every page was fetched
+    """
+    jobs = list(first_jobs)
+    complete = False
+    if known is None:
+        results = await fetch_pages(pages)
+        complete = all(result is not None for result in results)
+        for result in results:
+            jobs.extend(result or [])
+    elif not page_is_known(map(job_id, jobs), known):
+        for start in range(0, len(pages), wave_size):
+            results = await fetch_pages(pages[start:start + wave_size])
+            reached_known = False
+            for result in results:
+                jobs.extend(result or [])
+                if page_is_known(map(job_id, result or []), known):
+                    reached_known = True
+                    break
+            if reached_known:
+                log.info("[*] %s: reached known jobs after %s postings", label, len(jobs))
+                break
+
+    # Listings can shift between pages while we fetch, so drop repeats
+    unique_jobs = {}
+    for job in jobs:
+        unique_jobs.setdefault(job_id(job), job)
+    return list(unique_jobs.values()), complete
+
+
+def record_key(record):
+    """Jobs are keyed by Job ID, falling back to the URL for sources without one."""
+    return record.get("Job ID") or record.get("Job URL") or ""
+
+
+def fingerprint(record):
+    """Short content hash over a record's substantive fields."""
+    fields = {name: value for name, value in record.items() if name not in UNTRACKED_FIELDS}
+    data = json.dumps(fields, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()[:16]
+
+
+def sidecar_path(output_file):
+    """The Last Seen sidecar, kept (and committed) beside the archive in a .last_seen/ directory."""
+    return os.path.join(os.path.dirname(output_file), LAST_SEEN_DIR, os.path.basename(output_file))
+
+
+def load_sidecar(output_file):
+    """Load the sidecar kept beside an archive ({"Scraped At", "Last Seen"}), or {} if there is none."""
+    # Sidecars used to live in the untracked .cache/; read one from there until it is rewritten
+    legacy_path = os.path.join(cache_dir(), "last_seen", os.path.basename(output_file))
+    for path in (sidecar_path(output_file), legacy_path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            continue
+    return {}
+
+
+def load_last_seen(output_file):
+    """Load the per-job Last Seen timestamps kept beside an archive, or {} if there are none."""
+    return load_sidecar(output_file).get("Last Seen", {})
+
+
+def save_last_seen(output_file, last_seen, scraped_at):
+    """Write the per-job Last Seen timestamps for an archive to its sidecar."""
+    path = sidecar_path(output_file)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with atomic_write(path) as f:
+        json.dump({"Scraped At": scraped_at, "Last Seen": last_seen}, f, separators=(",", ":"))
+
+
+def strip_scrape_times(record, last_seen):
+    """
+    Move the per-run timestamps of an older archive record out of it: its Last Seen (or
+    Scraped At) into `last_seen` under the job's key, and Scraped At into First Seen.
+
+    Returns:
+        bool: True if the record had any to move
+    """
+    if not any(field in record for field in SCRAPE_TIME_FIELDS):
+        return False
+    scraped_at = record.pop("Scraped At", None)
+    seen = record.pop("Last Seen", None) or scraped_at
+    if seen:
+        last_seen[record_key(record)] = seen
+    if scraped_at and not record.get("First Seen"):
+        record["First Seen"] = scraped_at
+    return True
+
+
+class JobStore:
+    """
+    One company's job archive with an index from Job ID to list position.
+
+    Upserts and lookups are O(1), so merging a scrape stays linear in the number of
+    scraped jobs no matter how large the archive grows. Jobs that disappear from a
+    complete crawl are kept as tombstones with a "Removed At" timestamp.
+    """
+
+    def __init__(self, records=None):
+        self.records = []
+        self.index = {}
+        self.seen = set()
+        self.added = []
+        self.updated = []
+        self.removed = []
+        self.unchanged = 0
+        self.dirty = False
+        self.last_seen = {}
+        # When the archive was last saved, according to its sidecar
+        self.last_scraped = None
+        self.now = get_current_utc_timestamp()
+
+        duplicates = 0
+        for record in records or []:
+            key = record_key(record)
+            if strip_scrape_times(record, self.last_seen):
+                self.dirty = True
+            position = self.index.get(key)
+            if position is None:
+                self.index[key] = len(self.records)
+                self.records.append(record)
+            else:
+                # Keep the first position but the latest content, and the earliest First Seen
+                first_seen = self.records[position].get("First Seen")
+                if first_seen:
+                    record["First Seen"] = first_seen
+                self.records[position] = record
+                duplicates += 1
+        if duplicates:
+            log.info("Collapsed %s duplicate job IDs in stored archive", duplicates)
+            self.dirty = True
+        # Database positions as loaded, so a save can tell which rows moved
+        self.stored_positions = {}
+
+    @classmethod
+    def load(cls, output_file):
+        if sqlite_enabled():
+            records, positions = load_sqlite_jobs(output_file)
+            store = cls(records)
+            # Rewrite every row if loading already had to change records
+            if not store.dirty:
+                store.stored_positions = positions
+        else:
+            store = cls(load_existing_jobs(output_file))
+        sidecar = load_sidecar(output_file)
+        store.last_seen = {**store.last_seen, **sidecar.get("Last Seen", {})}
+        store.last_scraped = sidecar.get("Scraped At")
+        return store
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def get(self, key):
+        position = self.index.get(key)
+        return None if position is None else self.records[position]
+
+    def upsert(self, record):
+        """
+        Insert a scraped job or replace the stored job with the same key. A job whose
+        fingerprint matches the stored live job leaves the stored record as it is, and
+        a key repeated within one scrape keeps its first occurrence.
+        """
+        key = record_key(record)
+        if key in self.seen:
+            return self.get(key)
+        self.seen.add(key)
+        self.last_seen[key] = self.now
+        for field in SCRAPE_TIME_FIELDS:
+            record.pop(field, None)
+        record[FINGERPRINT_FIELD] = fingerprint(record)
+
+        position = self.index.get(key)
+        if position is None:
+            record["First Seen"] = self.now
+            self.index[key] = len(self.records)
+            self.records.append(record)
+            self.added.append(record)
+            self.dirty = True
+            return record
+
+        existing = self.records[position]
+        if not existing.get("Removed At") and existing.get(FINGERPRINT_FIELD) == record[FINGERPRINT_FIELD]:
+            self.unchanged += 1
+            return existing
+
+        record["First Seen"] = existing.get("First Seen") or self.now
+        if existing.get("Posted Date"):
+            record["Posted Date"] = existing["Posted Date"]
+            if "Posted Date Original" in existing:
+                record["Posted Date Original"] = existing["Posted Date Original"]
+        self.records[position] = record
+        self.dirty = True
+        self.updated.append(record)
+        return record
+
+    def tombstone_unseen(self):
+        """Mark every live job that was not upserted in this run as removed."""
+        for record in self.records:
+            if record_key(record) not in self.seen and not record.get("Removed At"):
+                record["Removed At"] = self.now
+                self.removed.append(record)
+                self.dirty = True
+
+    def finish(self, complete):
+        """
+        Close out a scrape. Only a complete crawl can tell that a job was taken down,
+        so unseen jobs are tombstoned only when `complete` is true and incremental mode is off.
+        """
+        if complete and not incremental_enabled():
+            self.tombstone_unseen()
+
+    def refresh_last_seen(self):
+        """
+        Mark the jobs the previous run saw as seen again, for a re-fetch that returned
+        the identical payload and so was not parsed. Those are the jobs whose Last Seen is
+        the previous save; without a sidecar to tell, every live job counts.
+        """
+        if self.last_scraped:
+            for key, seen in self.last_seen.items():
+                if seen == self.last_scraped:
+                    self.last_seen[key] = self.now
+        else:
+            for record in self.live_records():
+                self.last_seen[record_key(record)] = self.now
+
+    def live_records(self):
+        return [record for record in self.records if not record.get("Removed At")]
+
+    def sort(self, key, reverse=False):
+        """Sort the archive in place and rebuild the index."""
+        self.records.sort(key=key, reverse=reverse)
+        self.index = {record_key(record): position for position, record in enumerate(self.records)}
+
+    def save(self, output_file, sort_key=None, reverse=False):
+        """
+        Write the archive (including tombstones) to `output_file`, or its columnar counterpart.
+        Records are streamed to a temporary file that replaces the old one only once complete.
+        The archive is left untouched when no job was added, changed or removed.
+
+        Returns:
+            bool: True if the archive was rewritten
+        """
+        save_last_seen(output_file, self.last_seen, self.now)
+        if sqlite_enabled():
+            target = sqlite_store.db_path()
+        else:
+            target = columnar_path(output_file) if columnar_enabled() else output_file
+        if not self.dirty and os.path.exists(target):
+            log.info("No job changes, leaving %s as it is", target)
+            return False
+
+        if sort_key:
+            self.sort(sort_key, reverse=reverse)
+        if sqlite_enabled():
+            self.save_sqlite(output_file)
+        elif columnar_enabled():
+            write_columnar(self.records, target)
+        else:
+            write_json_array(output_file, self.records)
+        JobHistory.for_archive(output_file).record(self)
+        return True
+
+    def save_sqlite(self, output_file):
+        """Upsert only the rows this run added, changed, removed or moved."""
+        changed = {record_key(record) for record in self.added + self.updated + self.removed}
+        stored = [self.stored_positions.get(record_key(record)) for record in self.records]
+        positions = sqlite_store.assign_positions(stored)
+        rows = [
+            (position, record) for record, position, previous in zip(self.records, positions, stored)
+            if record_key(record) in changed or position != previous
+        ]
+        conn = sqlite_store.connect()
+        try:
+            sqlite_store.upsert_records(conn, company_for(output_file), rows)
+        finally:
+            conn.close()
+        log.info("Wrote %s changed rows to %s", len(rows), sqlite_store.db_path())
+
+    def print_summary(self, output_file):
+        not_scraped = len(self.records) - len(self.seen) - len(self.removed)
+        if sqlite_enabled():
+            log.info("Successfully processed %s jobs to %s", company_for(output_file), sqlite_store.db_path())
+        else:
+            log.info("Successfully processed jobs to %s", columnar_path(output_file) if columnar_enabled() else output_file)
+        log.info("  - Total jobs: %s (%s live)", len(self.records), len(self.live_records()))
+        log.info("  - New jobs added: %s", len(self.added))
+        log.info("  - Existing jobs updated: %s", len(self.updated))
+        log.info("  - Existing jobs unchanged: %s", self.unchanged)
+        log.info("  - Jobs removed: %s", len(self.removed))
+        log.info("  - Stored jobs not in this scrape: %s", not_scraped)
+
+        if self.added:
+            log.info("\nNew jobs added:")
+            for job in self.added[:5]:  # Show first 5 new jobs
+                log.info("  - %s (ID: %s)", job.get('Title', 'Unknown Title'), job.get('Job ID', 'Unknown'))
+            if len(self.added) > 5:
+                log.info("  ... and %s more", len(self.added) - 5)
@@ -0,0 +1,162 @@
+"""
+Atomic, streaming output for job files.
+Records are written one at a time to a temporary file next to the target, which is
+only renamed over the target once everything has been written and flushed, so a crash
+mid-write never leaves a truncated file for the site. The output is byte-identical to
+json.dump(records, f, indent=2, ensure_ascii=False). iter_json_array reads such a file
+back one record at a time.
+
+Raw API responses and HTML are only written when JOBS_SCRAPER_KEEP_RAW=1 is set, for
+debugging a scraper.
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from log_utils import get_logger
+
+log = get_logger("json_stream")
+
+RAW_DUMP_ENV_VAR = "JOBS_SCRAPER_KEEP_RAW"
+
+
+def keep_raw_enabled():
+    """Return True when scrapers should keep their raw responses on disk for debugging."""
+    return os.environ.get(RAW_DUMP_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+
+@contextmanager
+def atomic_write(path, mode="w"):
+    """
+    Open a temporary file next to `path` and move it over `path` when the block exits cleanly.
+
+    Args:
+        path (str): Destination file
+        mode (str): "w" for text (UTF-8) or "wb" for binary
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file owner-only; job files are meant to be world-readable
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class JsonArrayWriter:
+    """Write a JSON array one record at a time, atomically replacing `path` on close."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._context = None
+        self._file = None
+
+    def __enter__(self):
+        self._context = atomic_write(self.path)
+        self._file = self._context.__enter__()
+        return self
+
+    def write(self, record):
+        # Indent each record one level so the file matches json.dump(..., indent=2)
+        text = json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+        self._file.write(("[\n  " if self.count == 0 else ",\n  ") + text)
+        self.count += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self._file.write("[]" if self.count == 0 else "\n]")
+        return self._context.__exit__(exc_type, exc_value, traceback)
+
+
+def write_json_array(path, records):
+    """Stream an iterable of records to `path` as a JSON array; returns the number written."""
+    with JsonArrayWriter(path) as writer:
+        for record in records:
+            writer.write(record)
+    return writer.count
+
+
+def iter_json_array(path, chunk_size=1 << 16):
+    """
+    Yield the elements of a JSON array file one at a time without loading the whole file.
+
+    Raises:
+        ValueError: If the file is not a JSON array
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        position = 0
+        started = False
+        eof = False
+        while True:
+            # Skip whitespace and separators up to the next value
+            while True:
+                while position < len(buffer) and buffer[position] in " \t\r\n":
+                    position += 1
+                if position < len(buffer) or eof:
+                    break
+                chunk = f.read(chunk_size)
+                buffer, position, eof = buffer[position:] + chunk, 0, not chunk
+            if position >= len(buffer):
+                raise ValueError(f"{path}: unexpected end of JSON array")
+
+            character = buffer[position]
+            if not started:
+                if character != "[":
+                    raise ValueError(f"{path}: not a JSON array")
+                started = True
+                position += 1
+                continue
+            if character == "]":
+                return
+            if character == ",":
+                position += 1
+                continue
+
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except ValueError:
+                # The value runs past the buffer; read more and retry
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(buffer) and not eof:
+                chunk = f.read(chunk_size)
+                if chunk:
+                    buffer, position = buffer[position:] + chunk, 0
+                    continue
+                eof = True
+            yield value
+            position = end
+
+
+def dump_raw(path, data):
+    """
+    Save a raw response for debugging, only when JOBS_SCRAPER_KEEP_RAW is set.
+
+    Returns:
+        bool: True if the file was written
+    """
+    if not keep_raw_enabled():
+        return False
+    with atomic_write(path) as f:
+        if isinstance(data, str):
+            f.write(data)
+        else:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    log.info("Saved raw response to: %s", path)
+    return True
@@ -0,0 +1,155 @@
+"""
+Logging shared by every scraper.
+Modules log through get_logger(<module>) with %-style arguments, so a message below the
+configured level costs one level check, and the formatting is done on a background
+listener thread, never in the fetch loop. Records are handed to the listener through
+a queue and printed to stdout as plain lines (or as JSON objects with
+JOBS_SCRAPER_LOG_FORMAT=json). A warning repeated with the same message template is let
+through a few times a minute and then counted, with a note of how many were suppressed.
+
+    JOBS_SCRAPER_LOG_LEVEL=DEBUG python run_all.py                  # per-page detail
+    JOBS_SCRAPER_LOG_LEVELS=workday_client=DEBUG,date_utils=ERROR python run_all.py
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+ROOT_LOGGER = "jobs_scraper"
+LEVEL_ENV_VAR = "JOBS_SCRAPER_LOG_LEVEL"
+MODULE_LEVELS_ENV_VAR = "JOBS_SCRAPER_LOG_LEVELS"
+FORMAT_ENV_VAR = "JOBS_SCRAPER_LOG_FORMAT"
+
+# Repeated warnings: this many per message template and interval, the rest are counted
+RATE_LIMIT_BURST = 5
+RATE_LIMIT_INTERVAL = 60.0
+
+# The source being scraped, attached to log records and metrics (see metrics.source)
+current_source = contextvars.ContextVar("current_source", default="")
+
+
+class RateLimitFilter(logging.Filter):
+    """Pass `burst` records per logger and message template per `interval`, at `min_level` and above."""
+
+    def __init__(self, burst=RATE_LIMIT_BURST, interval=RATE_LIMIT_INTERVAL, min_level=logging.WARNING):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.min_level = min_level
+        self.lock = threading.Lock()
+        self.windows = {}
+
+    def filter(self, record):
+        record.source = current_source.get()
+        if record.levelno < self.min_level:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self.lock:
+            started, passed, suppressed = self.windows.get(key, (now, 0, 0))
+            if now - started >= self.interval:
+                # A new window: the first record through reports what the last one held back
+                held_back, started, passed, suppressed = suppressed, now, 0, 0
+            else:
+                held_back = 0
+            allow = passed < self.burst
+            self.windows[key] = (started, passed + 1, suppressed) if allow else (started, passed, suppressed + 1)
+        if held_back:
+            record.msg = f"{record.msg} [{held_back} similar messages suppressed]"
+        return allow
+
+    def drain(self):
+        """(logger name, message template, suppressed count) for every template still being held back."""
+        with self.lock:
+            held = [(name, msg, suppressed) for (name, msg), (_, _, suppressed) in self.windows.items() if suppressed]
+            self.windows.clear()
+        return held
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # The listener formats the message; only the traceback has to be captured here
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name[len(ROOT_LOGGER) + 1:],
+            "message": record.getMessage(),
+        }
+        if getattr(record, "source", ""):
+            entry["source"] = record.source
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def module_levels(spec):
+    """Parse "module=LEVEL,module=LEVEL" into {module: level}."""
+    levels = {}
+    for item in (spec or "").split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+_listener = None
+_rate_limit = RateLimitFilter()
+_setup_lock = threading.Lock()
+
+
+def setup_logging(level=None):
+    """Configure the shared logger and start the queue listener (once per process)."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel((level or os.environ.get(LEVEL_ENV_VAR) or "INFO").upper())
+        root.propagate = False
+        for name, module_level in module_levels(os.environ.get(MODULE_LEVELS_ENV_VAR)).items():
+            logging.getLogger(f"{ROOT_LOGGER}.{name}").setLevel(module_level)
+
+        console = logging.StreamHandler(sys.stdout)
+        if os.environ.get(FORMAT_ENV_VAR, "").lower() == "json":
+            console.setFormatter(JsonFormatter())
+        else:
+            console.setFormatter(logging.Formatter("%(message)s"))
+
+        records = queue.SimpleQueue()
+        handler = _LazyQueueHandler(records)
+        handler.addFilter(_rate_limit)
+        root.addHandler(handler)
+        _listener = logging.handlers.QueueListener(records, console)
+        _listener.start()
+        atexit.register(shutdown)
+
+
+def get_logger(name):
+    setup_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def shutdown():
+    """Report warnings that are still being held back and stop the listener."""
+    global _listener
+    for name, msg, suppressed in _rate_limit.drain():
+        logging.getLogger(name).warning("%d more messages like %r were suppressed", suppressed, msg)
+    with _setup_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
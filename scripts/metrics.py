@@ -0,0 +1,271 @@
+"""
+Per-run timing and counters for the scrape pipeline.
+Spans time each stage of a source (fetch, parse, normalize, merge, write, and browser
+startup). Counters track requests, pages, retries, bytes and records, and a histogram
+tracks request latency. Everything is labelled with the source being scraped. At the
+end of a run, the metrics are written as JSON lines (.metrics.jsonl) and in the
+Prometheus text format (.metrics.prom) next to the job files.
+
+Metrics are off unless JOBS_SCRAPER_METRICS=1 (or run_all.py --metrics). While off,
+span() returns a shared no-op context manager and count()/observe() return at once.
+"""
+
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from json_stream import atomic_write
+from log_utils import current_source, get_logger
+
+log = get_logger("metrics")
+
+METRICS_ENV_VAR = "JOBS_SCRAPER_METRICS"
+JSONL_FILE = ".metrics.jsonl"
+PROMETHEUS_FILE = ".metrics.prom"
+PREFIX = "jobs_scraper_"
+
+# Upper bounds in seconds, shared by the stage and request latency histograms
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """(upper bound, observations <= bound) pairs ending with +Inf, as Prometheus expects."""
+        total, pairs = 0, []
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class Registry:
+    """Counters, histograms and finished spans of one run."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.spans = []
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def count(self, name, value, labels):
+        key = self._key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, labels):
+        key = self._key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def add_span(self, stage, labels, started_at, seconds):
+        self.observe("stage_seconds", seconds, {**labels, "stage": stage})
+        with self.lock:
+            self.spans.append({"type": "span", "name": stage, "labels": labels,
+                               "start": round(started_at, 6), "seconds": round(seconds, 6)})
+
+    def records(self):
+        """Every metric as a JSON-serializable dict, preceded by a run header."""
+        finished_at = time.time()
+        yield {"type": "run", "started_at": round(self.started_at, 3), "finished_at": round(finished_at, 3),
+               "seconds": round(finished_at - self.started_at, 3)}
+        with self.lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                yield {"type": "counter", "name": name, "labels": dict(labels), "value": value}
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                yield {"type": "histogram", "name": name, "labels": dict(labels), "count": histogram.count,
+                       "sum": round(histogram.sum, 6),
+                       "buckets": {str(bound): count for bound, count in histogram.cumulative()}}
+            yield from list(self.spans)
+
+    def prometheus(self):
+        """The counters and histograms in the Prometheus text exposition format."""
+        def labels_text(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for _, value in pairs)
+            return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+        lines = []
+        with self.lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = f"{PREFIX}{name}_total"
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric}{labels_text(labels)} {value}")
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                metric = f"{PREFIX}{name}"
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f"# TYPE {metric} histogram")
+                for bound, count in histogram.cumulative():
+                    lines.append(f"{metric}_bucket{labels_text(labels, [('le', bound)])} {count}")
+                lines.append(f"{metric}_sum{labels_text(labels)} {histogram.sum:.6f}")
+                lines.append(f"{metric}_count{labels_text(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("registry", "stage", "labels", "started_at", "started")
+
+    def __init__(self, registry, stage, labels):
+        self.registry = registry
+        self.stage = stage
+        self.labels = labels
+
+    def __enter__(self):
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.add_span(self.stage, self.labels, self.started_at, time.perf_counter() - self.started)
+        return False
+
+
+def enabled():
+    return _registry is not None
+
+
+def enable():
+    """Start collecting metrics for this process; they are written at exit unless write() ran first."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = Registry()
+            atexit.register(_write_at_exit)
+    return _registry
+
+
+def _labels(labels):
+    source = current_source.get()
+    return {"source": source, **labels} if source else labels
+
+
+def span(stage, **labels):
+    """Time a block as one run of `stage` (a no-op while metrics are off)."""
+    if _registry is None:
+        return NULL_SPAN
+    return _Span(_registry, stage, _labels(labels))
+
+
+def count(name, value=1, **labels):
+    if _registry is not None:
+        _registry.count(name, value, _labels(labels))
+
+
+def observe(name, value, **labels):
+    if _registry is not None:
+        _registry.observe(name, value, _labels(labels))
+
+
+@contextmanager
+def source(name):
+    """Label everything measured inside the block with the source `name`."""
+    token = current_source.set(name)
+    try:
+        yield
+    finally:
+        current_source.reset(token)
+
+
+def default_directory():
+    from sources import jobs_dir
+
+    return jobs_dir()
+
+
+def write(directory=None):
+    """
+    Write this run's metrics as JSON lines and Prometheus text.
+
+    Returns:
+        tuple: (jsonl_path, prometheus_path), or None while metrics are off
+    """
+    global _registry
+    with _registry_lock:
+        registry, _registry = _registry, None
+    if registry is None:
+        return None
+
+    directory = directory or default_directory()
+    os.makedirs(directory, exist_ok=True)
+    jsonl_path = os.path.join(directory, JSONL_FILE)
+    prometheus_path = os.path.join(directory, PROMETHEUS_FILE)
+    with atomic_write(jsonl_path) as f:
+        for record in registry.records():
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    with atomic_write(prometheus_path) as f:
+        f.write(registry.prometheus())
+    print_summary(registry)
+    log.info("Metrics written to %s and %s", jsonl_path, prometheus_path)
+    return jsonl_path, prometheus_path
+
+
+def _write_at_exit():
+    if _registry is not None:
+        write()
+
+
+def print_summary(registry):
+    """Seconds spent per source and stage, and the main counters."""
+    stages, counters = {}, {}
+    with registry.lock:
+        for (name, labels), histogram in registry.histograms.items():
+            if name == "stage_seconds":
+                labels = dict(labels)
+                stages[(labels.get("source", ""), labels["stage"])] = histogram
+        for (name, labels), value in registry.counters.items():
+            source_name = dict(labels).get("source", "")
+            counters[(source_name, name)] = counters.get((source_name, name), 0) + value
+
+    log.info("\n=== Stage Timings ===")
+    for (source_name, stage), histogram in sorted(stages.items()):
+        log.info("%-12s %-14s %8.2fs  (%sx)", source_name or "-", stage, histogram.sum, histogram.count)
+    sources = sorted({source_name for source_name, _ in counters})
+    for source_name in sources:
+        values = ", ".join(f"{name} {value:g}" for (counted, name), value in sorted(counters.items()) if counted == source_name)
+        log.info("%-12s %s", source_name or "-", values)
+
+
+if os.environ.get(METRICS_ENV_VAR, "").lower() in ("1", "true", "yes"):
+    enable()
@@ -0,0 +1,221 @@
+"""
+Versioned migrations for the stored job archives.
+Each migration is a numbered, idempotent transform of one record, registered with
+@migration. Timestamps a migration moves out of the records go to the archive's
+jobs/.last_seen/ sidecar, as JobStore does. Running the tool applies every migration
+newer than the version recorded for a file in jobs/.schema_versions.json, streaming the
+file record by record and processing files in parallel across a process pool. Rerunning
+it is a no-op, and a file whose records come out unchanged is not rewritten.
+
+Usage:
+    python migrate.py                  # migrate every archive in ../jobs
+    python migrate.py --list           # show the registered migrations
+    python migrate.py --dry-run        # count the records each file would change
+    python migrate.py ../jobs --workers 4
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from columnar_store import COLUMNAR_SUFFIX, json_path_for, read_columnar, write_columnar
+from date_utils import normalize_date_to_utc
+from job_store import fingerprint, FINGERPRINT_FIELD, load_last_seen, save_last_seen, strip_scrape_times
+from json_stream import atomic_write, iter_json_array, JsonArrayWriter
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_JOBS_DIR = os.path.join(SCRIPT_DIR, "..", "jobs")
+VERSIONS_FILE = ".schema_versions.json"
+ARCHIVE_PATTERNS = ("*_jobs_processed.json", f"*_jobs_processed{COLUMNAR_SUFFIX}")
+
+ISO_TIMESTAMP = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$")
+
+MIGRATIONS = []
+
+
+def migration(version, description):
+    """
+    Register `fn(record, last_seen) -> record` as migration `version`. `last_seen` collects
+    per-job Last Seen timestamps for the archive's sidecar.
+    """
+    def register(fn):
+        if any(existing[0] == version for existing in MIGRATIONS):
+            raise ValueError(f"Migration version {version} is already registered")
+        MIGRATIONS.append((version, description, fn))
+        MIGRATIONS.sort(key=lambda entry: entry[0])
+        return fn
+    return register
+
+
+def latest_version():
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def _reference_time(record):
+    """When a record was scraped, for resolving relative dates like "Posted 3 Days Ago"."""
+    scraped = record.get("Scraped At") or record.get("First Seen")
+    if scraped and ISO_TIMESTAMP.match(scraped):
+        return datetime.strptime(scraped, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    return None
+
+
+@migration(1, "Normalize Posted Date to UTC ISO, relative to when the job was scraped")
+def normalize_posted_dates(record, last_seen):
+    posted = record.get("Posted Date")
+    # Already-normalized dates are left alone, so a second run cannot shift them
+    if not posted or not isinstance(posted, str) or ISO_TIMESTAMP.match(posted):
+        return record
+    record.setdefault("Posted Date Original", posted)
+    record["Posted Date"] = normalize_date_to_utc(posted, _reference_time(record))
+    return record
+
+
+@migration(2, "Move per-run scrape timestamps out of the records")
+def move_scrape_times(record, last_seen):
+    strip_scrape_times(record, last_seen)
+    return record
+
+
+@migration(3, "Add the content fingerprint used for change detection")
+def add_fingerprint(record, last_seen):
+    if FINGERPRINT_FIELD not in record:
+        record[FINGERPRINT_FIELD] = fingerprint(record)
+    return record
+
+
+def load_versions(jobs_dir):
+    try:
+        with open(os.path.join(jobs_dir, VERSIONS_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_versions(jobs_dir, versions):
+    with atomic_write(os.path.join(jobs_dir, VERSIONS_FILE)) as f:
+        json.dump(versions, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def apply_migrations(record, pending, last_seen):
+    """Run the pending migrations on one record; return (record, changed)."""
+    before = json.dumps(record, sort_keys=True, ensure_ascii=False)
+    for _, _, fn in pending:
+        record = fn(record, last_seen)
+    return record, json.dumps(record, sort_keys=True, ensure_ascii=False) != before
+
+
+class _Unchanged(Exception):
+    """Abandons the temporary output of a file whose records did not change."""
+
+
+def migrate_file(path, from_version, dry_run=False):
+    """
+    Apply every migration newer than `from_version` to one archive.
+
+    Returns:
+        tuple: (path, records, changed_records)
+    """
+    pending = [entry for entry in MIGRATIONS if entry[0] > from_version]
+    total = changed = 0
+    last_seen = {}
+
+    if path.endswith(COLUMNAR_SUFFIX):
+        records = []
+        for record in read_columnar(path):
+            record, record_changed = apply_migrations(record, pending, last_seen)
+            records.append(record)
+            changed += record_changed
+        if changed and not dry_run:
+            _save_last_seen(json_path_for(path), last_seen)
+            write_columnar(records, path)
+        return path, len(records), changed
+
+    try:
+        with JsonArrayWriter(path) as writer:
+            for record in iter_json_array(path):
+                record, record_changed = apply_migrations(record, pending, last_seen)
+                total += 1
+                changed += record_changed
+                if not dry_run:
+                    writer.write(record)
+            if dry_run or not changed:
+                raise _Unchanged()
+            # Before the archive is replaced, so a failed write cannot lose the timestamps
+            _save_last_seen(path, last_seen)
+    except _Unchanged:
+        pass
+    return path, total, changed
+
+
+def _save_last_seen(output_file, last_seen):
+    """Add the timestamps moved out of an archive to its sidecar; entries already there win."""
+    if not last_seen:
+        return
+    merged = {**last_seen, **load_last_seen(output_file)}
+    save_last_seen(output_file, merged, max(merged.values()))
+
+
+def archive_files(jobs_dir):
+    paths = []
+    for pattern in ARCHIVE_PATTERNS:
+        paths.extend(glob.glob(os.path.join(jobs_dir, pattern)))
+    return sorted(paths)
+
+
+def migrate_all(jobs_dir=DEFAULT_JOBS_DIR, workers=None, dry_run=False):
+    """
+    Migrate every archive in `jobs_dir` that is behind the latest version, in parallel.
+
+    Returns:
+        list: (path, records, changed_records) per migrated file
+    """
+    versions = load_versions(jobs_dir)
+    target = latest_version()
+    pending = [path for path in archive_files(jobs_dir) if versions.get(os.path.basename(path), 0) < target]
+    if not pending:
+        print(f"All archives are at schema version {target}")
+        return []
+
+    print(f"Migrating {len(pending)} archives to schema version {target}")
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(migrate_file, path, versions.get(os.path.basename(path), 0), dry_run)
+            for path in pending
+        ]
+        for future in futures:
+            path, total, changed = future.result()
+            results.append((path, total, changed))
+            print(f"  {'Would change' if dry_run else 'Changed'} {changed} of {total} records in {os.path.basename(path)}")
+            if not dry_run:
+                versions[os.path.basename(path)] = target
+
+    if not dry_run:
+        save_versions(jobs_dir, versions)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply versioned migrations to the job archives.")
+    parser.add_argument("jobs_dir", nargs="?", default=DEFAULT_JOBS_DIR)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--dry-run", action="store_true", help="Count changes without writing")
+    parser.add_argument("--list", action="store_true", help="List the registered migrations")
+    args = parser.parse_args()
+
+    if args.list:
+        versions = load_versions(args.jobs_dir)
+        for version, description, _ in MIGRATIONS:
+            print(f"{version:3d}  {description}")
+        for name, version in sorted(versions.items()):
+            print(f"  {name}: version {version}")
+        return
+    migrate_all(args.jobs_dir, args.workers, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""
+Record and replay the responses scrapers see, so they can run and be timed offline.
+With JOBS_SCRAPER_RECORD=<dir>, every response that goes through the fetch scheduler
+(Workday job pages, Tesla's careers state, Apple search pages) and every document,
+script and API response a browser context loads (Meta's page and GraphQL responses,
+the Workday browser fallback) is saved to a fixture directory.
+
+ReplayServer serves a fixture directory over local HTTP, with optional latency and
+injected errors. With JOBS_SCRAPER_REPLAY_SERVER=<url>, the fetch scheduler sends its
+requests to that server instead of the real site and browser contexts fulfil their
+requests from it, so a scraper runs unchanged against the recording.
+
+Usage:
+    JOBS_SCRAPER_RECORD=fixtures/replay/tesla python tesla_jobs_scraper.py
+    python replay.py serve fixtures/replay/tesla --port 8765 --latency 0.05 --error-rate 0.1
+    JOBS_SCRAPER_REPLAY_SERVER=http://127.0.0.1:8765 python tesla_jobs_scraper.py
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+import requests
+from http_cache import content_hash
+from json_stream import atomic_write
+
+RECORD_ENV_VAR = "JOBS_SCRAPER_RECORD"
+REPLAY_SERVER_ENV_VAR = "JOBS_SCRAPER_REPLAY_SERVER"
+
+# Browser resources worth recording; images, fonts, stylesheets and media are not
+# needed to reproduce what a scraper extracts and are aborted during replay
+RECORDED_RESOURCE_TYPES = {"document", "script", "xhr", "fetch"}
+
+# Response headers kept with a recorded body
+STORED_HEADERS = ("Content-Type", "Location", "Retry-After")
+
+
+def _as_bytes(body):
+    if body is None:
+        return b""
+    return body.encode("utf-8") if isinstance(body, str) else bytes(body)
+
+
+def request_key(method, url, body=None):
+    """Exact match key: method, full URL (including the query string) and request body."""
+    return f"{method.upper()} {url} {hashlib.sha256(_as_bytes(body)).hexdigest()}"
+
+
+class FixtureStore:
+    """
+    A directory of recorded exchanges: exchanges.jsonl indexes them in recording order,
+    and bodies/ holds each distinct response body once, named by its hash.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "exchanges.jsonl")
+        self.bodies_dir = os.path.join(directory, "bodies")
+        self.lock = threading.Lock()
+        self.exact = {}
+        self.by_url = {}
+        self.served = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+
+    def __len__(self):
+        return sum(len(exchanges) for exchanges in self.exact.values())
+
+    def _index(self, exchange):
+        self.exact.setdefault(exchange["key"], []).append(exchange)
+        self.by_url.setdefault(f"{exchange['method']} {exchange['url']}", []).append(exchange)
+
+    def record(self, method, url, request_body, status, headers, content):
+        """Append one exchange to the fixture directory."""
+        content = _as_bytes(content)
+        body_name = content_hash(content)
+        exchange = {
+            "key": request_key(method, url, request_body),
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "headers": {name: headers[name] for name in STORED_HEADERS if headers.get(name)},
+            "body": body_name,
+        }
+        with self.lock:
+            os.makedirs(self.bodies_dir, exist_ok=True)
+            body_path = os.path.join(self.bodies_dir, body_name)
+            if not os.path.exists(body_path):
+                with atomic_write(body_path, "wb") as f:
+                    f.write(content)
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(exchange, ensure_ascii=False) + "\n")
+            self._index(exchange)
+
+    def next_exchange(self, method, url, body=None):
+        """
+        The recorded answer to a request, or None. Repeated requests get the recorded
+        answers in order, then the last one again. A request whose body differs from
+        every recording (session tokens in a page's POST body) falls back to the
+        exchanges recorded for the same method and URL.
+
+        Returns:
+            tuple: (exchange, exact) where `exact` is False for a fallback match
+        """
+        for key, exact in ((request_key(method, url, body), True), (f"{method.upper()} {url}", False)):
+            exchanges = (self.exact if exact else self.by_url).get(key)
+            if exchanges:
+                with self.lock:
+                    served = self.served.get(key, 0)
+                    self.served[key] = served + 1
+                return exchanges[min(served, len(exchanges) - 1)], exact
+        return None, False
+
+    def body(self, exchange):
+        with open(os.path.join(self.bodies_dir, exchange["body"]), "rb") as f:
+            return f.read()
+
+    def rewind(self):
+        """Serve repeated requests from their first recording again (before the next replayed run)."""
+        with self.lock:
+            self.served.clear()
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def recorder():
+    """The fixture store this process records into, or None when not recording."""
+    global _recorder
+    directory = os.environ.get(RECORD_ENV_VAR)
+    if not directory:
+        return None
+    with _recorder_lock:
+        if _recorder is None or _recorder.directory != directory:
+            _recorder = FixtureStore(directory)
+        return _recorder
+
+
+def replay_server():
+    """Base URL of the replay server requests are sent to, or None."""
+    return os.environ.get(REPLAY_SERVER_ENV_VAR, "").rstrip("/") or None
+
+
+def active():
+    """True while recording or replaying; the HTTP cache is bypassed then."""
+    return bool(os.environ.get(RECORD_ENV_VAR) or replay_server())
+
+
+def replay_url(url):
+    """Where to send a request for `url`: the replay server when replaying, otherwise `url` itself."""
+    server = replay_server()
+    if not server:
+        return url
+    parts = urlsplit(url)
+    return f"{server}/{parts.scheme}/{url[len(parts.scheme) + 3:]}"
+
+
+def original_url(path):
+    """Inverse of replay_url for the path the replay server receives."""
+    scheme, _, rest = path.lstrip("/").partition("/")
+    return f"{scheme}://{rest}"
+
+
+def record_response(response):
+    """Record a requests.Response the fetch scheduler is about to return, when recording."""
+    store = recorder()
+    if store is None:
+        return
+    # Key redirected responses by the request the scraper made
+    request = response.history[0].request if response.history else response.request
+    store.record(request.method, request.url, request.body, response.status_code,
+                 response.headers, response.content)
+
+
+def attach(context):
+    """Record or replay the requests of a new Playwright browser context."""
+    store = recorder()
+    server = replay_server()
+
+    if store is not None:
+        def handle_response(response):
+            request = response.request
+            if request.resource_type not in RECORDED_RESOURCE_TYPES:
+                return
+            try:
+                body = b"" if 300 <= response.status < 400 else response.body()
+            except Exception:
+                return
+            headers = {name: response.headers.get(name.lower()) for name in STORED_HEADERS}
+            store.record(request.method, request.url, request.post_data_buffer, response.status, headers, body)
+
+        context.on("response", handle_response)
+
+    elif server is not None:
+        session = requests.Session()
+
+        def forward(route):
+            request = route.request
+            if request.resource_type not in RECORDED_RESOURCE_TYPES:
+                route.abort()
+                return
+            try:
+                response = session.request(request.method, replay_url(request.url),
+                                           data=request.post_data_buffer, timeout=60, allow_redirects=False)
+            except requests.RequestException:
+                route.abort()
+                return
+            headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+            route.fulfill(status=response.status_code, headers=headers, body=response.content)
+
+        context.route("**/*", forward)
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.replay.handle(self)
+
+    do_POST = do_PUT = do_DELETE = do_HEAD = do_GET
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ThreadingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class ReplayServer:
+    """
+    Local stand-in for the career sites, answering from a FixtureStore.
+
+    Args:
+        store (FixtureStore): Recorded exchanges to serve
+        latency (float): Seconds added before every response
+        jitter (float): Extra random delay of up to this many seconds
+        error_rate (float): Fraction of requests answered with `error_status` instead
+        error_status (int): Status for injected errors (429/5xx are retried by the scheduler)
+        port (int): Port to listen on, 0 for any free port
+    """
+
+    def __init__(self, store, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, port=0, seed=None):
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.httpd = _ThreadingServer(("127.0.0.1", port), _ReplayHandler)
+        self.httpd.replay = self
+        self.thread = None
+        self.reset_stats()
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {"requests": 0, "served": 0, "fallback": 0, "missing": 0, "errors": 0, "bytes": 0}
+        self.store.rewind()
+
+    def _count(self, **increments):
+        with self.lock:
+            for name, value in increments.items():
+                self.stats[name] += value
+
+    def handle(self, handler):
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else None
+        url = original_url(handler.path)
+
+        with self.lock:
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+            inject_error = self.error_rate and self.random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+
+        if inject_error:
+            self._count(requests=1, errors=1)
+            self._send(handler, self.error_status, {"Retry-After": "0", "Content-Type": "text/plain"}, b"injected error")
+            return
+
+        exchange, exact = self.store.next_exchange(handler.command, url, body)
+        if exchange is None:
+            self._count(requests=1, missing=1)
+            self._send(handler, 404, {"Content-Type": "text/plain"}, f"no recording for {handler.command} {url}".encode("utf-8"))
+            return
+        content = self.store.body(exchange)
+        self._count(requests=1, served=1, fallback=0 if exact else 1, bytes=len(content))
+        self._send(handler, exchange["status"], exchange["headers"], content)
+
+    @staticmethod
+    def _send(handler, status, headers, content):
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(content)))
+        handler.end_headers()
+        if handler.command != "HEAD":
+            handler.wfile.write(content)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="replay-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded scraper responses.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Serve a fixture directory until interrupted")
+    serve.add_argument("fixtures")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    serve.add_argument("--jitter", type=float, default=0.0, help="Random extra delay of up to this many seconds")
+    serve.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error")
+    serve.add_argument("--error-status", type=int, default=503)
+    show = commands.add_parser("list", help="List the exchanges in a fixture directory")
+    show.add_argument("fixtures")
+    args = parser.parse_args()
+
+    store = FixtureStore(args.fixtures)
+    if args.command == "list":
+        for exchanges in store.exact.values():
+            for exchange in exchanges:
+                print(f"{exchange['status']}  {exchange['method']:<5} {exchange['url']}")
+        print(f"{len(store)} exchanges")
+        return
+
+    server = ReplayServer(store, args.latency, args.jitter, args.error_rate, args.error_status, args.port)
+    print(f"Replaying {len(store)} exchanges from {args.fixtures} at {server.url}")
+    print(f"Point scrapers at it with {REPLAY_SERVER_ENV_VAR}={server.url}")
+    with server:
+        try:
+            server.thread.join()
+        except KeyboardInterrupt:
+            pass
+    print(f"Served: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Run every registered job source (see sources.py) in one process.
+HTTP scrapers run concurrently and share the fetch scheduler's connection pool,
+Playwright scrapers share a single browser with one context per company, and a
+per-scraper timing and result summary is written next to the job files. With
+--metrics, per-stage timings and counters are written there too (see metrics.py).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from browser_pool import BrowserPool
+import metrics
+from job_store import INCREMENTAL_ENV_VAR, count_live_jobs
+from sources import jobs_dir, load_adapters, run_pipeline
+from log_utils import get_logger
+
+log = get_logger("run_all")
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SUMMARY_FILE_NAME = ".run_summary.json"
+
+
+def count_jobs(adapter):
+    """Count the live (not removed) jobs a source has in the configured storage."""
+    try:
+        return count_live_jobs(adapter.output_file)
+    except Exception:
+        return None
+
+
+def run_scraper(company, adapter, browser_pool):
+    """Run one source through the pipeline, timing it and capturing failures."""
+    started = time.perf_counter()
+    result = {"company": company, "status": "ok", "error": None}
+    try:
+        run_pipeline(adapter, browser_pool)
+    except Exception as e:
+        log.warning("[!] %s scraper failed: %s", company, e)
+        result["status"] = "failed"
+        result["error"] = str(e)
+    result["seconds"] = round(time.perf_counter() - started, 2)
+    result["jobs"] = count_jobs(adapter)
+    return result
+
+
+def write_summary(results, total_seconds):
+    summary = {
+        "finished_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "total_seconds": round(total_seconds, 2),
+        "scrapers": results,
+    }
+    summary_file = os.path.join(jobs_dir(), SUMMARY_FILE_NAME)
+    os.makedirs(jobs_dir(), exist_ok=True)
+    with open(summary_file, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    log.info("\n=== Scraper Summary ===")
+    for result in results:
+        jobs = result["jobs"] if result["jobs"] is not None else "-"
+        log.info("%-12s %-7s %8.1fs  %s jobs", result['company'], result['status'], result['seconds'], jobs)
+    log.info("Total: %.1fs", total_seconds)
+    log.info("Summary written to %s", summary_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run all job scrapers concurrently in one process.")
+    parser.add_argument("companies", nargs="*", help="Only run these companies (default: all)")
+    parser.add_argument("--headed", action="store_true", help="Run the shared browser with a visible window")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Stop paginating at already-known jobs and merge into the existing files")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Write per-stage timings and counters to jobs/.metrics.jsonl and jobs/.metrics.prom")
+    args = parser.parse_args()
+
+    if args.incremental:
+        os.environ[INCREMENTAL_ENV_VAR] = "1"
+    if args.metrics:
+        metrics.enable()
+
+    # Scrapers resolve their output paths relative to the scripts directory
+    os.chdir(SCRIPT_DIR)
+    sys.path.insert(0, SCRIPT_DIR)
+
+    scrapers = dict(sorted(load_adapters().items()))
+    if args.companies:
+        scrapers = {company: adapter for company, adapter in scrapers.items() if company in args.companies}
+
+    log.info("=== Running %s scrapers (%s) ===", len(scrapers), time.strftime('%Y-%m-%d %H:%M:%S'))
+
+    started = time.perf_counter()
+    with BrowserPool(headless=not args.headed) as browser_pool:
+        with ThreadPoolExecutor(max_workers=max(1, len(scrapers))) as executor:
+            futures = [
+                executor.submit(run_scraper, company, adapter, browser_pool)
+                for company, adapter in scrapers.items()
+            ]
+            results = [future.result() for future in futures]
+
+    # Individual failures are reported in the summary rather than failing the whole run
+    write_summary(results, time.perf_counter() - started)
+    metrics.write()
+
+
+if __name__ == "__main__":
+    main()
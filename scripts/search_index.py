@@ -0,0 +1,214 @@
+"""
+Prebuilt inverted index for the dashboard search.
+The company, Title, Location, Posted Date, Department and Team are tokenized, like the
+columns DataTables searched before the index existed, into a sorted vocabulary with a
+delta-encoded posting list of document IDs per token. Every query token is matched as
+a prefix with a binary search over the vocabulary, so a keystroke costs a few list
+merges instead of a scan over every row. Company and location facets are stored as
+bitmaps when dense and as ID lists when sparse.
+
+Document IDs are positions in the site bundle (shard offset + row), which is how
+app.js maps search hits back to table rows.
+
+Usage:
+    python search_index.py "software engineer" [--company nvidia] [--location "Santa Clara, CA"]
+    python search_index.py --self-test
+"""
+
+import argparse
+import base64
+import bisect
+import gzip
+import json
+import os
+import re
+
+INDEX_VERSION = 2
+INDEX_FIELDS = ["company", "Title", "Location", "Posted Date", "Department", "Team"]
+FACET_FIELDS = {"company": "company", "location": "Location"}
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Lowercase word tokens; app.js uses the equivalent /[\\p{L}\\p{N}_]+/gu pattern."""
+    if not isinstance(text, str):
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _delta(ids):
+    previous = 0
+    deltas = []
+    for doc_id in ids:
+        deltas.append(doc_id - previous)
+        previous = doc_id
+    return deltas
+
+
+def _undelta(deltas):
+    total = 0
+    ids = []
+    for delta in deltas:
+        total += delta
+        ids.append(total)
+    return ids
+
+
+def _encode_facet(ids, doc_count):
+    """Store a facet as a bitmap when that is smaller than a list of 32-bit IDs."""
+    if len(ids) * 32 < doc_count:
+        return {"ids": _delta(ids)}
+    bitmap = bytearray((doc_count + 7) // 8)
+    for doc_id in ids:
+        bitmap[doc_id >> 3] |= 1 << (doc_id & 7)
+    return {"bitmap": base64.b64encode(bytes(bitmap)).decode("ascii")}
+
+
+def _decode_facet(facet):
+    if "ids" in facet:
+        return set(_undelta(facet["ids"]))
+    bitmap = base64.b64decode(facet["bitmap"])
+    return {
+        (byte_index << 3) | bit
+        for byte_index, byte in enumerate(bitmap) if byte
+        for bit in range(8) if byte & (1 << bit)
+    }
+
+
+def build_index(docs):
+    """
+    Build the index for `docs`, a list of job dicts whose list position is the document ID.
+
+    Returns:
+        dict: The JSON-serializable index
+    """
+    postings = {}
+    facets = {name: {} for name in FACET_FIELDS}
+    for doc_id, doc in enumerate(docs):
+        tokens = set()
+        for field in INDEX_FIELDS:
+            tokens.update(tokenize(doc.get(field)))
+        for token in tokens:
+            postings.setdefault(token, []).append(doc_id)
+        for name, field in FACET_FIELDS.items():
+            value = (doc.get(field) or "").strip() if isinstance(doc.get(field), str) else ""
+            if value:
+                facets[name].setdefault(value, []).append(doc_id)
+
+    vocabulary = sorted(postings)
+    return {
+        "version": INDEX_VERSION,
+        "doc_count": len(docs),
+        "fields": INDEX_FIELDS,
+        "vocabulary": vocabulary,
+        "postings": [_delta(postings[token]) for token in vocabulary],
+        "facets": {
+            name: {value: _encode_facet(ids, len(docs)) for value, ids in sorted(values.items())}
+            for name, values in facets.items()
+        },
+    }
+
+
+class SearchIndex:
+    """Query API over a built index; mirrors the JavaScript implementation in app.js."""
+
+    def __init__(self, data):
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported search index version: {data.get('version')}")
+        self.doc_count = data["doc_count"]
+        self.vocabulary = data["vocabulary"]
+        self.postings = data["postings"]
+        self.facets = data["facets"]
+        self._decoded = {}
+
+    @classmethod
+    def load(cls, path):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _posting(self, position):
+        ids = self._decoded.get(position)
+        if ids is None:
+            ids = self._decoded[position] = set(_undelta(self.postings[position]))
+        return ids
+
+    def lookup_prefix(self, prefix):
+        """Document IDs containing any token that starts with `prefix`."""
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = bisect.bisect_left(self.vocabulary, prefix + "\uffff", start)
+        matches = set()
+        for position in range(start, end):
+            matches |= self._posting(position)
+        return matches
+
+    def facet(self, name, value):
+        facet = self.facets.get(name, {}).get(value)
+        return _decode_facet(facet) if facet else set()
+
+    def search(self, query="", company=None, location=None):
+        """
+        Return the sorted IDs of documents matching every query token (as a prefix)
+        and the given company/location facets.
+        """
+        result = None
+        for token in sorted(set(tokenize(query)), key=len, reverse=True):
+            matches = self.lookup_prefix(token)
+            result = matches if result is None else result & matches
+            if not result:
+                return []
+        for name, value in (("company", company), ("location", location)):
+            if value:
+                matches = self.facet(name, value)
+                result = matches if result is None else result & matches
+        if result is None:
+            return list(range(self.doc_count))
+        return sorted(result)
+
+
+def test_search_matches_table_search():
+    """Company names and dates find the same rows the DataTables search did."""
+    docs = [
+        {"company": "nvidia", "Title": "Deep Learning Engineer", "Location": "Santa Clara, CA",
+         "Posted Date": "2025-06-29T14:30:00Z"},
+        {"company": "apple", "Title": "Software Engineer", "Location": "Cupertino, CA",
+         "Posted Date": "2025-06-30T09:00:00Z"},
+        {"company": "salesforce", "Title": "Data Analyst", "Location": "Remote",
+         "Posted Date": "2025-05-01T00:00:00Z"},
+    ]
+
+    def table_search(query):
+        # DataTables smart search: every word must appear somewhere in the row's text
+        rows = [" ".join(str(doc.get(field) or "") for field in INDEX_FIELDS).lower() for doc in docs]
+        return [doc_id for doc_id, row in enumerate(rows) if all(word in row for word in query.lower().split())]
+
+    index = SearchIndex(json.loads(json.dumps(build_index(docs))))
+    for query in ("nvidia", "NVIDIA engineer", "apple", "sales", "2025-06-29", "2025-06", "engineer ca"):
+        assert index.search(query) == table_search(query), query
+    assert index.search("nvidia", company="apple") == []
+    print("search index self-test passed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the prebuilt job search index.")
+    parser.add_argument("query", nargs="?", default="")
+    parser.add_argument("--self-test", action="store_true", help="Check the index against table search and exit")
+    parser.add_argument("--company")
+    parser.add_argument("--location")
+    parser.add_argument("--index", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                        "..", "jobs", "site", "search-index.json"))
+    args = parser.parse_args()
+
+    if args.self_test:
+        test_search_matches_table_search()
+        return
+
+    index = SearchIndex.load(args.index)
+    hits = index.search(args.query, company=args.company, location=args.location)
+    print(f"{len(hits)} matching jobs")
+    print(hits[:20])
+
+
+if __name__ == "__main__":
+    main()
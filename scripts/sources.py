@@ -0,0 +1,250 @@
+"""
+Source adapters and the processing pipeline they share.
+Each company is a SourceAdapter that fetches a raw payload (pages of API results,
+intercepted responses...) and parses it into JobRecords. run_pipeline does everything
+else once for every source, over the whole batch: skipping payloads identical to the
+last run's, dropping duplicate jobs, normalizing posted dates and merging the records
+into the stored archive.
+
+Adapters register themselves by name. The Workday sites are plain config entries in
+workday_client.WORKDAY_SITES; the other sources define an adapter in their scraper module.
+"""
+
+import glob
+import importlib
+import json
+import os
+import time
+from date_utils import add_scrape_metadata_batch
+from http_cache import process_if_changed
+from job_store import incremental_enabled, JobStore, known_values, save_last_seen
+from json_stream import dump_raw
+import metrics
+from log_utils import get_logger
+
+log = get_logger("sources")
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+JOBS_DIR = os.path.join(SCRIPT_DIR, "..", "jobs")
+JOBS_DIR_ENV_VAR = "JOBS_SCRAPER_JOBS_DIR"
+
+# Modules that register adapters when imported
+ADAPTER_MODULES = ["workday_client"]
+
+ADAPTERS = {}
+
+
+def jobs_dir():
+    """Where archives are written (JOBS_SCRAPER_JOBS_DIR overrides jobs/, e.g. for benchmarks)."""
+    return os.environ.get(JOBS_DIR_ENV_VAR) or JOBS_DIR
+
+
+class JobRecord:
+    """One parsed job: the fields every source has, plus source-specific extras in order."""
+
+    __slots__ = ("job_id", "title", "location", "posted_date", "job_url", "extra")
+
+    def __init__(self, job_id, title, location="", posted_date=None, job_url="", extra=None):
+        self.job_id = job_id
+        self.title = title
+        self.location = location
+        # None for sources that never give a date, so the record has no Posted Date field
+        self.posted_date = posted_date
+        self.job_url = job_url
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, job):
+        extra = {
+            key: value for key, value in job.items()
+            if key not in ("Job ID", "Title", "Location", "Posted Date", "Job URL")
+        }
+        return cls(job.get("Job ID", ""), job.get("Title", ""), job.get("Location", ""),
+                   job.get("Posted Date"), job.get("Job URL", ""), extra)
+
+    @property
+    def key(self):
+        """Same key as job_store.record_key."""
+        return self.job_id or self.job_url or ""
+
+    def to_dict(self):
+        record = {"Job ID": self.job_id, "Title": self.title, "Location": self.location}
+        if self.posted_date is not None:
+            record["Posted Date"] = self.posted_date
+        record["Job URL"] = self.job_url
+        if self.extra:
+            record.update(self.extra)
+        return record
+
+
+class SourceAdapter:
+    """
+    Base class for a job source.
+
+    Args:
+        name (str): Company name, used for the output file and the registry
+        label (str): Name shown in logs (defaults to the capitalized name)
+    """
+
+    # Stored field whose values let an incremental crawl stop early, or None
+    known_field = "Job ID"
+    # Archive order: a function of the stored record, or None to keep insertion order
+    sort_key = None
+    reverse = False
+
+    def __init__(self, name, label=None):
+        self.name = name
+        self.label = label or name.capitalize()
+
+    @property
+    def output_file(self):
+        return os.path.join(jobs_dir(), f"{self.name}_jobs_processed.json")
+
+    @property
+    def raw_file(self):
+        return os.path.join(jobs_dir(), f"{self.name}_jobs_raw.json")
+
+    def fetch(self, known, browser_pool=None):
+        """
+        Fetch the raw payload.
+
+        Args:
+            known (set): Stored values of `known_field` in incremental mode, otherwise None
+            browser_pool (BrowserPool): Shared browser for sources that need one
+
+        Returns:
+            tuple: (payload, complete) where `payload` is None if nothing could be fetched
+                and `complete` tells whether it holds every live job
+        """
+        raise NotImplementedError
+
+    def parse(self, payload):
+        """Yield a JobRecord for every job in the payload."""
+        raise NotImplementedError
+
+
+def register(adapter):
+    ADAPTERS[adapter.name] = adapter
+    return adapter
+
+
+def load_adapters():
+    """Import every module that registers adapters and return the registry."""
+    modules = list(ADAPTER_MODULES)
+    for path in sorted(glob.glob(os.path.join(SCRIPT_DIR, "*_jobs_scraper.py"))):
+        modules.append(os.path.splitext(os.path.basename(path))[0])
+    for module_name in modules:
+        importlib.import_module(module_name)
+    return ADAPTERS
+
+
+def get_adapter(name):
+    if name not in ADAPTERS:
+        load_adapters()
+    return ADAPTERS[name]
+
+
+def unique_records(records):
+    """Drop repeated jobs, keeping the first occurrence like JobStore.upsert does."""
+    seen = set()
+    for record in records:
+        key = record.key
+        if key not in seen:
+            seen.add(key)
+            yield record
+
+
+def store_records(adapter, records, complete, store=None):
+    """
+    Normalize a batch of records and merge it into the adapter's archive (`store`, if
+    it was already loaded); return the count.
+    """
+    with metrics.span("parse"):
+        entries = [record.to_dict() for record in unique_records(records)]
+    with metrics.span("normalize"):
+        entries = add_scrape_metadata_batch(entries)
+    metrics.count("records", len(entries))
+    log.info("Found %s unique %s jobs.", len(entries), adapter.label)
+    if not entries:
+        log.info("No job data found.")
+        return 0
+
+    with metrics.span("merge"):
+        if store is None:
+            store = JobStore.load(adapter.output_file)
+        for entry in entries:
+            store.upsert(entry)
+        store.finish(complete=complete)
+    with metrics.span("write"):
+        store.save(adapter.output_file, sort_key=adapter.sort_key, reverse=adapter.reverse)
+    metrics.count("records_added", len(store.added))
+    metrics.count("records_updated", len(store.updated))
+    metrics.count("records_removed", len(store.removed))
+    store.print_summary(adapter.output_file)
+    return len(entries)
+
+
+def refresh_unchanged(adapter, store=None):
+    """
+    Record that the jobs of a payload identical to the last run's were seen again,
+    without parsing it or rewriting the archive; return the number of live jobs.
+    """
+    with metrics.span("merge"):
+        if store is None:
+            store = JobStore.load(adapter.output_file)
+        store.refresh_last_seen()
+    with metrics.span("write"):
+        save_last_seen(adapter.output_file, store.last_seen, store.now)
+    return len(store.live_records())
+
+
+def load_raw(adapter):
+    """The payload kept by an earlier debugging run (JOBS_SCRAPER_KEEP_RAW=1), if any."""
+    if not os.path.exists(adapter.raw_file):
+        return None
+    log.info("[*] Loading job data from existing %s...", adapter.raw_file)
+    try:
+        with open(adapter.raw_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        log.warning("Error loading JSON from file: %s", e)
+        return None
+
+
+def run_pipeline(adapter, browser_pool=None):
+    """
+    Fetch, parse and store one source.
+
+    Returns:
+        int: Number of jobs stored (the live jobs already stored when the payload was
+            unchanged), 0 if it was empty
+    """
+    with metrics.source(adapter.name), metrics.span("total"):
+        return _run_pipeline(adapter, browser_pool)
+
+
+def _run_pipeline(adapter, browser_pool):
+    log.info("=== %s Jobs Scraper (%s) ===", adapter.label, time.strftime('%Y-%m-%d %H:%M:%S'))
+    os.makedirs(jobs_dir(), exist_ok=True)
+
+    store = known = None
+    if adapter.known_field and incremental_enabled():
+        # Loaded once: its IDs stop the crawl early, and the scrape is merged into it
+        store = JobStore.load(adapter.output_file)
+        known = known_values(store, adapter.known_field)
+    with metrics.span("fetch"):
+        payload, complete = adapter.fetch(known, browser_pool)
+    if payload:
+        dump_raw(adapter.raw_file, payload)
+    else:
+        payload, complete = load_raw(adapter), False
+    if not payload:
+        log.warning("❌ No job data retrieved for %s.", adapter.label)
+        return 0
+
+    stored = []
+    if not process_if_changed(adapter.name, payload,
+                              lambda: stored.append(store_records(adapter, adapter.parse(payload), complete, store))):
+        stored.append(refresh_unchanged(adapter, store))
+    log.info("\n✅ Process complete! Check %s for the job listings.", adapter.output_file)
+    return stored[0]
@@ -0,0 +1,278 @@
+"""
+SQLite storage backend for the job archives.
+All companies share one database (jobs/jobs.sqlite) in WAL mode. Each job is one row
+keyed by (company, job_id) holding the full record as JSON, plus the columns that
+queries filter on (title, location, posted date, removal time), which are indexed. A
+full-text index over titles is kept in step by triggers when SQLite has FTS5.
+
+Scrapers write through it with JOBS_STORAGE_FORMAT=sqlite: JobStore upserts only the
+rows a run added, changed, removed or moved, in one batched transaction. Archive order
+is kept in a fractional position column, so a new job sorted to the top of an archive
+gets a position before the first row instead of renumbering every row after it. The site's
+JSON files are regenerated from the database with the exporter.
+
+Usage:
+    python sqlite_store.py import-all ../jobs       # load the JSON archives into the database
+    python sqlite_store.py export-all ../jobs       # regenerate the JSON archives
+    python sqlite_store.py search "data scientist" --company nvidia
+"""
+
+import argparse
+import bisect
+import glob
+import json
+import os
+import sqlite3
+from job_history import ARCHIVE_SUFFIX, company_for
+from json_stream import write_json_array
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(SCRIPT_DIR, "..", "jobs", "jobs.sqlite")
+DB_PATH_ENV_VAR = "JOBS_SQLITE_PATH"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    company TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    position REAL NOT NULL,
+    title TEXT,
+    location TEXT,
+    posted_date TEXT,
+    removed_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_company_job_id ON jobs (company, job_id);
+CREATE INDEX IF NOT EXISTS jobs_posted_date ON jobs (posted_date);
+CREATE INDEX IF NOT EXISTS jobs_location ON jobs (location);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(title, content='jobs', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts (rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    INSERT INTO jobs_fts (rowid, title) VALUES (new.id, new.title);
+END;
+"""
+
+UPSERT = """
+INSERT INTO jobs (company, job_id, position, title, location, posted_date, removed_at, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (company, job_id) DO UPDATE SET
+    position = excluded.position, title = excluded.title, location = excluded.location,
+    posted_date = excluded.posted_date, removed_at = excluded.removed_at, data = excluded.data
+"""
+
+
+def db_path():
+    return os.environ.get(DB_PATH_ENV_VAR) or DEFAULT_DB_PATH
+
+
+def connect(path=None):
+    """Open the database in WAL mode and create the schema if needed."""
+    path = path or db_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # Scrapers run in threads of one process; a writer waits for another instead of failing
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    try:
+        conn.executescript(FTS_SCHEMA)
+    except sqlite3.OperationalError:
+        # This SQLite build has no FTS5; title search falls back to LIKE
+        pass
+    return conn
+
+
+def has_fts(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'jobs_fts'").fetchone() is not None
+
+
+def _row(company, position, record):
+    return (
+        company,
+        record.get("Job ID") or record.get("Job URL") or "",
+        position,
+        record.get("Title"),
+        record.get("Location"),
+        record.get("Posted Date"),
+        record.get("Removed At"),
+        json.dumps(record, ensure_ascii=False, separators=(",", ":")),
+    )
+
+
+def upsert_records(conn, company, positioned_records):
+    """Insert or update (position, record) pairs for one company in a single transaction."""
+    with conn:
+        conn.executemany(UPSERT, [_row(company, position, record) for position, record in positioned_records])
+
+
+def load_company(conn, company):
+    """
+    All of a company's records (including tombstones) in archive order.
+
+    Returns:
+        tuple: (records, positions) where `positions` maps each job key to its stored position
+    """
+    records, positions = [], {}
+    for job_id, position, data in conn.execute(
+            "SELECT job_id, position, data FROM jobs WHERE company = ? ORDER BY position", (company,)):
+        records.append(json.loads(data))
+        positions[job_id] = position
+    return records, positions
+
+
+def assign_positions(stored):
+    """
+    Choose positions for rows in their new order while moving as few rows as possible.
+
+    Args:
+        stored (list): Each row's stored position in the new order, or None for new rows
+
+    Returns:
+        list: A strictly increasing position per row; rows whose stored position is kept
+            form a longest increasing run, the others get positions between their neighbours
+    """
+    # Longest strictly increasing subsequence of the stored positions (patience sorting)
+    tails, tail_rows, previous = [], [], {}
+    for row, position in enumerate(stored):
+        if position is None:
+            continue
+        slot = bisect.bisect_left(tails, position)
+        previous[row] = tail_rows[slot - 1] if slot else None
+        if slot == len(tails):
+            tails.append(position)
+            tail_rows.append(row)
+        else:
+            tails[slot] = position
+            tail_rows[slot] = row
+    kept = set()
+    row = tail_rows[-1] if tail_rows else None
+    while row is not None:
+        kept.add(row)
+        row = previous[row]
+
+    positions = [stored[row] if row in kept else None for row in range(len(stored))]
+    row = 0
+    while row < len(positions):
+        if positions[row] is not None:
+            row += 1
+            continue
+        end = row
+        while end < len(positions) and positions[end] is None:
+            end += 1
+        low = positions[row - 1] if row else None
+        high = positions[end] if end < len(positions) else None
+        count = end - row
+        if low is None and high is None:
+            low, high = 0.0, float(count + 1)
+        elif low is None:
+            low = high - (count + 1)
+        elif high is None:
+            high = low + (count + 1)
+        step = (high - low) / (count + 1)
+        if step <= abs(high) * 1e-12:
+            # Positions have run out of precision; renumber every row
+            return [float(position) for position in range(len(stored))]
+        for offset in range(count):
+            positions[row + offset] = low + step * (offset + 1)
+        row = end
+    return positions
+
+
+def company_count(conn, company):
+    return conn.execute("SELECT COUNT(*) FROM jobs WHERE company = ?", (company,)).fetchone()[0]
+
+
+def live_count(conn, company):
+    return conn.execute("SELECT COUNT(*) FROM jobs WHERE company = ? AND removed_at IS NULL", (company,)).fetchone()[0]
+
+
+def import_json(conn, json_file):
+    """Replace a company's rows with the contents of its JSON archive."""
+    company = company_for(json_file)
+    with open(json_file, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    # Collapse duplicate keys like JobStore does: first position, latest record
+    positions, unique = {}, []
+    for record in records:
+        key = record.get("Job ID") or record.get("Job URL") or ""
+        if key in positions:
+            unique[positions[key]] = record
+        else:
+            positions[key] = len(unique)
+            unique.append(record)
+    with conn:
+        conn.execute("DELETE FROM jobs WHERE company = ?", (company,))
+    upsert_records(conn, company, enumerate(unique))
+    return company, len(unique)
+
+
+def export_json(conn, company, json_file):
+    """Regenerate a company's JSON archive from the database."""
+    records, _ = load_company(conn, company)
+    write_json_array(json_file, records)
+    return len(records)
+
+
+def companies(conn):
+    return [company for (company,) in conn.execute("SELECT DISTINCT company FROM jobs ORDER BY company")]
+
+
+def search_titles(conn, query, company=None, live_only=True, limit=50):
+    """Jobs whose title matches `query` (FTS5 syntax when available), best matches first."""
+    conditions, params = [], []
+    if has_fts(conn):
+        sql = "SELECT jobs.data FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid WHERE jobs_fts MATCH ?"
+        params.append(query)
+        order = " ORDER BY rank"
+    else:
+        sql = "SELECT data FROM jobs WHERE title LIKE ?"
+        params.append(f"%{query}%")
+        order = ""
+    if company:
+        conditions.append("company = ?")
+        params.append(company)
+    if live_only:
+        conditions.append("removed_at IS NULL")
+    sql += "".join(f" AND {condition}" for condition in conditions) + order + " LIMIT ?"
+    params.append(limit)
+    return [json.loads(data) for (data,) in conn.execute(sql, params)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the SQLite job database.")
+    parser.add_argument("--db", help=f"Database path (default: {DB_PATH_ENV_VAR} or jobs/jobs.sqlite)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("import-all", "export-all"):
+        command = commands.add_parser(name)
+        command.add_argument("jobs_dir", nargs="?", default=os.path.join(SCRIPT_DIR, "..", "jobs"))
+    search = commands.add_parser("search")
+    search.add_argument("query")
+    search.add_argument("--company")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if args.command == "import-all":
+        for json_file in sorted(glob.glob(os.path.join(args.jobs_dir, f"*{ARCHIVE_SUFFIX}"))):
+            company, count = import_json(conn, json_file)
+            print(f"Imported {count} {company} jobs")
+    elif args.command == "export-all":
+        for company in companies(conn):
+            json_file = os.path.join(args.jobs_dir, f"{company}{ARCHIVE_SUFFIX}")
+            print(f"Exported {export_json(conn, company, json_file)} {company} jobs to {json_file}")
+    else:
+        for record in search_titles(conn, args.query, args.company):
+            print(f"  - {record.get('Title', 'Unknown Title')} ({record.get('Location', '')}) {record.get('Job URL', '')}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
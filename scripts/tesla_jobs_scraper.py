@@ -1,271 +1,151 @@
-from playwright.sync_api import sync_playwright
-import json
-import os
-import time
-from date_utils import add_scrape_metadata, get_current_utc_timestamp
+from fetch_scheduler import get_scheduler
+from browser_pool import run_in_browser
+import metrics
+from sources import JobRecord, SourceAdapter, register, run_pipeline
+from log_utils import get_logger
 
+log = get_logger("tesla_jobs_scraper")
 
-def process_jobs_data(json_data, output_file):
-    """Process the raw Tesla jobs JSON data and save as structured JSON file, sorted by job ID in descending order."""
-    # Ensure the jobs directory exists
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    # Extract the job listings
-    listings = json_data.get("listings", [])
-    print(f"Found {len(listings)} job listings.")
-    
-    # Create dictionaries to map IDs to human-readable names
-    locations = {}
-    for loc_id, loc_name in json_data.get("lookup", {}).get("locations", {}).items():
-        locations[loc_id] = loc_name
-        
-    departments = {}
-    for dept_id, dept_name in json_data.get("lookup", {}).get("departments", {}).items():
-        departments[dept_id] = dept_name
-    
-    # Process the data
-    job_data = []
-    for job in listings:
-        # Extract job details
-        job_id = job.get("id", "")
-        title = job.get("t", "")
-        department_id = job.get("dp", "")
-        location_id = job.get("l", "")
-        
-        # Map IDs to human-readable names
-        department = departments.get(department_id, "Unknown Department")
-        location = locations.get(location_id, "Unknown Location")
-        
-        # Create job entry
-        # Create slug from title for URL (lowercase, replace spaces with hyphens, remove special chars)
-        slug = title.lower()
-        # Remove quotes and special characters
-        slug = ''.join(c if c.isalnum() or c.isspace() else ' ' for c in slug)
-        # Replace spaces with hyphens and remove multiple consecutive hyphens
-        slug = '-'.join(filter(None, slug.split()))
-        
-        job_entry = {
-            "Job ID": job_id,
-            "Title": title,
-            "Department": department,
-            "Location": location,
-            "Job URL": f"https://www.tesla.com/careers/search/job/{slug}-{job_id}",
-            "Posted Date": ""  # Tesla doesn't provide posted dates in API
-        }
-        
-        # Add all other fields that might be useful
-        for key, value in job.items():
-            if key not in ["id", "t", "dp", "l"]:
-                job_entry[key] = value
-        
-        # Standardize date format and add scrape metadata
-        job_entry = add_scrape_metadata(job_entry)
-        job_data.append(job_entry)
+STATE_API_PATH = "cua-api/apps/careers/state"
+TESLA_STATE_URL = f"https://www.tesla.com/{STATE_API_PATH}"
+TESLA_CAREERS_URL = "https://www.tesla.com/careers/search/?type=3&site=US"
+# The careers app, its bot checks and the state API are all served from tesla.com
+TESLA_DOMAINS = ("tesla.com",)
 
-    # Process the JSON data
-    if job_data:
-        # Sort job_data by Job ID in descending order (most recent first)
-        job_data_sorted = sorted(job_data, key=lambda x: int(x.get("Job ID", 0)), reverse=True)
-        
-        # Write to JSON file
-        with open(output_file, "w", encoding="utf-8") as json_file:
-            json.dump(job_data_sorted, json_file, indent=2)
-        
-        print(f"Successfully processed {len(job_data)} jobs to JSON: {output_file}")
-        
-        # Check for update date information in the JSON
-        print("\nChecking for job update date information:")
-        
-        # Check all job entries for date-related fields
-        all_fields = set()
-        for job in job_data:
-            all_fields.update(job.keys())
-        
-        date_fields = [field for field in all_fields if any(keyword in field.lower() for keyword in ["date", "updated", "timestamp"])]
-        
-        if date_fields:
-            print(f"Found potential update date fields: {', '.join(date_fields)}")
-        else:
-            print("No explicit update date fields found in the job data.")
-            
-            # Check for any other metadata at the top level that might indicate timing
-            top_level_time_fields = []
-            for key in json_data.keys():
-                if any(keyword in key.lower() for keyword in ["date", "updated", "timestamp", "time"]):
-                    top_level_time_fields.append(key)
-            
-            if top_level_time_fields:
-                print(f"Found potential time-related fields at the top level: {', '.join(top_level_time_fields)}")
-            else:
-                print("No time-related fields found at the top level of the JSON.")
-                
-        return job_data_sorted
-    else:
-        print("No job data found.")
-        return []
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36",
+    "Accept": "application/json",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": TESLA_CAREERS_URL,
+}
 
 
-def main():
-    # Get the directory where the script is located
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    raw_json_file = os.path.join(script_dir, "tesla_jobs_playwright.json")
-    processed_json_file = os.path.join(script_dir, "../jobs/tesla_jobs_processed.json")
-    
-    print(f"=== Tesla Jobs Scraper ({time.strftime('%Y-%m-%d %H:%M:%S')}) ===")
-    
-    with sync_playwright() as p:
-        print("Launching browser...")
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context()
-        all_jobs_data = []
-        all_locations = {}
-        all_departments = {}
+def job_from_listing(listing, locations, departments):
+    """Map one careers state listing to a JobRecord (Tesla gives no posted dates)."""
+    job_id = listing.get("id", "")
+    title = listing.get("t", "")
+    # Create slug from title for URL (lowercase, replace spaces with hyphens, remove special chars)
+    slug = title.lower()
+    # Remove quotes and special characters
+    slug = ''.join(c if c.isalnum() or c.isspace() else ' ' for c in slug)
+    # Replace spaces with hyphens and remove multiple consecutive hyphens
+    slug = '-'.join(filter(None, slug.split()))
+
+    extra = {"Department": departments.get(listing.get("dp", ""), "Unknown Department")}
+    # Add all other fields that might be useful
+    for key, value in listing.items():
+        if key not in ["id", "t", "dp", "l"]:
+            extra[key] = value
+    return JobRecord(job_id, title, locations.get(listing.get("l", ""), "Unknown Location"),
+                     "", f"https://www.tesla.com/careers/search/job/{slug}-{job_id}", extra)
+
+
+def merge_state(combined, state):
+    """Fold one careers state payload into `combined`, deduplicating listings by id as they arrive."""
+    for job in state.get("listings", []):
+        combined["listings"].setdefault(str(job.get("id", "")), job)
+    lookup = state.get("lookup", {})
+    combined["lookup"]["locations"].update(lookup.get("locations", {}))
+    combined["lookup"]["departments"].update(lookup.get("departments", {}))
 
-        # Open a new page
-        page = context.new_page()
 
-        # Function to capture the API response
-        def handle_response(response):
-            nonlocal all_jobs_data, all_locations, all_departments
-            if "cua-api/apps/careers/state" in response.url and response.status == 200:
-                print(f"[+] Intercepted API response: {response.url}")
-                try:
-                    json_data = response.json()
-                    listings = json_data.get("listings", [])
-                    print(f"Found {len(listings)} jobs in this batch")
-                    all_jobs_data.extend(listings)
-                    
-                    # Collect lookup data
-                    lookup = json_data.get("lookup", {})
-                    if "locations" in lookup:
-                        all_locations.update(lookup["locations"])
-                    if "departments" in lookup:
-                        all_departments.update(lookup["departments"])
-                        
-                except Exception as e:
-                    print(f"Failed to parse JSON: {e}")
+def fetch_state(cookies=None):
+    """Fetch the careers state (every listing plus the lookup tables) directly over HTTP."""
+    response = get_scheduler().get(TESLA_STATE_URL, headers=HEADERS, cookies=cookies)
+    response.raise_for_status()
+    state = response.json()
+    if "listings" not in state:
+        raise ValueError("careers state response has no listings")
+    return state
 
-        # Add listener BEFORE navigation
-        page.on("response", handle_response)
 
-        print("[*] Navigating to Tesla careers page...")
-        page.wait_for_timeout(1000)  # Wait 1 second before navigation
-        page.goto("https://www.tesla.com/careers/search/?type=3&site=US", timeout=60000)
+def fetch_state_with_browser(browser_pool=None):
+    """
+    Fallback: load the careers page in Chromium to pass the bot checks.
+
+    Returns:
+        tuple: (cookies, state) with the session cookies for replaying the state request
+            and the state payload the page fetched itself, if it was captured
+    """
+    def collect(context):
+        page = context.new_page()
+        state = None
+        log.info("[*] Navigating to Tesla careers page...")
+        try:
+            with page.expect_response(lambda r: STATE_API_PATH in r.url and r.status == 200, timeout=60000) as response_info:
+                page.goto(TESLA_CAREERS_URL, timeout=60000, wait_until="commit")
+            state = response_info.value.json()
+            metrics.count("pages")
+            log.debug("[+] Intercepted careers state: %s", response_info.value.url)
+        except Exception as e:
+            log.warning("[!] No careers state response from the page: %s", e)
+        cookies = {cookie["name"]: cookie["value"] for cookie in context.cookies()}
+        return cookies, state
+
+    return run_in_browser("tesla", collect, browser_pool, allowed_domains=TESLA_DOMAINS)
 
-        # Give page time to load + make API calls
-        print("[*] Waiting for initial API calls to complete...")
-        page.wait_for_timeout(10000)  # Wait 10 seconds for requests to finish
-        
-        # Try to load more jobs by scrolling and interacting with filters
-        max_iterations = 10
-        iteration = 0
-        
-        while iteration < max_iterations:
-            print(f"[*] Attempting to load more jobs (iteration {iteration + 1})...")
-            
-            # Scroll to bottom to trigger any lazy loading
-            page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            page.wait_for_timeout(3000)
-            
-            # Try clicking different filters to load more job categories
-            filter_selectors = [
-                "button:has-text('All Locations')",
-                "button:has-text('All Teams')",
-                "button:has-text('Engineering')",
-                "button:has-text('Manufacturing')", 
-                "button:has-text('Sales & Service')",
-                "button:has-text('Supply Chain')",
-                "button:has-text('Information Technology')"
-            ]
-            
-            # Try each filter to potentially load more jobs
-            for selector in filter_selectors:
-                try:
-                    filter_button = page.locator(selector).first
-                    if filter_button.is_visible(timeout=1000):
-                        print(f"[+] Clicking filter: {selector}")
-                        filter_button.click()
-                        page.wait_for_timeout(3000)  # Wait for API calls
-                        break
-                except:
-                    continue
-            
-            # Look for "Load More" or pagination buttons
-            load_more_selectors = [
-                "button:has-text('Load More')",
-                "button:has-text('Show More')", 
-                "button[data-testid='load-more']",
-                ".load-more",
-                "button[aria-label*='more']"
-            ]
-            
-            button_found = False
-            for selector in load_more_selectors:
-                try:
-                    load_more_button = page.locator(selector).first
-                    if load_more_button.is_visible(timeout=2000):
-                        print(f"[+] Found load more button: {selector}")
-                        load_more_button.click()
-                        page.wait_for_timeout(5000)
-                        button_found = True
-                        break
-                except:
-                    continue
-            
-            if not button_found:
-                print("[*] No more load buttons found...")
-            
-            iteration += 1
 
-        browser.close()
-        print("Browser closed.")
-        
-        # Combine all collected data
-        if all_jobs_data:
-            combined_data = {
-                "listings": all_jobs_data,
-                "lookup": {
-                    "locations": all_locations,
-                    "departments": all_departments
-                }
-            }
-            
-            with open(raw_json_file, "w", encoding="utf-8") as f:
-                json.dump(combined_data, f, indent=2)
-            print(f"[+] Collected total of {len(all_jobs_data)} jobs across all iterations")
-            
-            print("\n[*] Processing job data to JSON...")
-            process_jobs_data(combined_data, processed_json_file)
-            
-            # Delete the raw JSON file after processing
-            if os.path.exists(raw_json_file):
-                try:
-                    os.remove(raw_json_file)
-                    print(f"[*] Deleted raw JSON file: {raw_json_file}")
-                except Exception as e:
-                    print(f"Warning: Could not delete raw JSON file: {e}")
-            
-            print(f"\n✅ Process complete! Check {processed_json_file} for the sorted job listings.")
+def fetch_jobs(browser_pool=None):
+    """
+    Fetch every Tesla listing from the careers state endpoint, falling back to a browser
+    session for cookies when the direct request is rejected.
+
+    Returns:
+        dict: {"listings", "lookup", "complete"} or None if nothing could be fetched
+    """
+    combined = {"listings": {}, "lookup": {"locations": {}, "departments": {}}}
+    try:
+        merge_state(combined, fetch_state())
+    except Exception as e:
+        log.warning("[!] Direct careers state request failed (%s), falling back to a browser session...", e)
+        cookies, page_state = fetch_state_with_browser(browser_pool)
+        if page_state:
+            merge_state(combined, page_state)
         else:
-            # Try to load from file if API response wasn't captured
-            if os.path.exists(raw_json_file):
-                print(f"\n[*] Loading job data from existing {raw_json_file}...")
-                with open(raw_json_file, "r", encoding="utf-8") as f:
-                    try:
-                        json_data = json.load(f)
-                        process_jobs_data(json_data, processed_json_file)
-                        
-                        # Delete the raw JSON file after processing
-                        try:
-                            os.remove(raw_json_file)
-                            print(f"[*] Deleted raw JSON file: {raw_json_file}")
-                        except Exception as e:
-                            print(f"Warning: Could not delete raw JSON file: {e}")
-                        
-                        print(f"\n✅ Process complete! Check {processed_json_file} for the sorted job listings.")
-                    except Exception as e:
-                        print(f"Error loading JSON from file: {e}")
-            else:
-                print(f"❌ No job data captured and no existing {raw_json_file} file found.")
+            try:
+                merge_state(combined, fetch_state(cookies))
+            except Exception as e:
+                log.warning("[!] Careers state request with browser cookies failed: %s", e)
+
+    if not combined["listings"]:
+        return None
+    log.info("[+] Collected %s unique listings", len(combined['listings']))
+    return {
+        "listings": list(combined["listings"].values()),
+        "lookup": combined["lookup"],
+        # The state endpoint returns every listing at once
+        "complete": True,
+    }
+
+
+class TeslaAdapter(SourceAdapter):
+    """Every Tesla listing from the careers state endpoint."""
+
+    # The state endpoint always returns every listing, so there is nothing to stop early on
+    known_field = None
+    reverse = True
+
+    @staticmethod
+    def sort_key(job):
+        # Highest (newest) Job ID first
+        return int(job.get("Job ID") or 0)
+
+    def fetch(self, known, browser_pool=None):
+        json_data = fetch_jobs(browser_pool)
+        return json_data, bool(json_data and json_data.get("complete"))
+
+    def parse(self, json_data):
+        lookup = json_data.get("lookup", {})
+        locations = lookup.get("locations", {})
+        departments = lookup.get("departments", {})
+        return (job_from_listing(listing, locations, departments) for listing in json_data.get("listings", []))
+
+
+ADAPTER = register(TeslaAdapter("tesla"))
+
+
+def main(browser_pool=None):
+    run_pipeline(ADAPTER, browser_pool)
 
 
 if __name__ == "__main__":
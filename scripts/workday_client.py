@@ -0,0 +1,278 @@
+"""
+Async client for the Workday candidate-experience jobs API.
+Accenture, NVIDIA and Salesforce all host their career sites on Workday, and every
+one of them serves listings from the same `/wday/cxs/<tenant>/<site>/jobs` endpoint.
+This module posts to that endpoint directly and fetches all pages concurrently
+through the shared fetch scheduler.
+
+Each Workday company is one WorkdayAdapter entry in WORKDAY_SITES; adding a company
+running on Workday only takes a new entry.
+"""
+
+import asyncio
+from fetch_scheduler import get_scheduler
+from job_store import crawl_pages
+import metrics
+from sources import JobRecord, SourceAdapter, register
+from log_utils import get_logger
+
+log = get_logger("workday_client")
+
+# The cxs endpoint rejects requests with a limit above 20
+WORKDAY_PAGE_SIZE = 20
+
+# Hosts the careers app itself loads from; the browser fallback aborts everything else
+WORKDAY_DOMAINS = ("myworkdayjobs.com", "myworkdaycdn.com", "myworkdaysite.com", "workday.com")
+
+# "Load More" buttons and pagination controls seen on Workday sites, in order of preference,
+# as (css selector, button text) pairs probed in one pass by browser_pool.find_first_visible
+PAGINATION_TARGETS = [
+    ("button[data-automation-id='loadMoreJobs']", None),
+    ("button", "Load More"),
+    ("button", "Show More"),
+    ("button", "See More"),
+    ("[data-automation-id='paginationMoreButton']", None),
+    (".css-19uc56f", None),  # Common Workday pagination button class
+    ("button[aria-label*='more']", None),
+    ("button[aria-label='Go to next page']", None),
+]
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36"
+
+
+class WorkdayClient:
+    """Fetch job postings from one Workday tenant/site through the shared fetch scheduler."""
+
+    def __init__(self, host, tenant, site, concurrency=8, search_text="", scheduler=None):
+        self.host = host
+        self.tenant = tenant
+        self.site = site
+        self.concurrency = concurrency
+        self.search_text = search_text
+        self.scheduler = scheduler or get_scheduler()
+        self.headers = {
+            "accept": "application/json",
+            "content-type": "application/json",
+            "origin": f"https://{host}",
+            "referer": f"https://{host}/en-US/{site}",
+            "user-agent": USER_AGENT,
+        }
+
+    @property
+    def jobs_url(self):
+        return f"https://{self.host}/wday/cxs/{self.tenant}/{self.site}/jobs"
+
+    def _post_page(self, offset):
+        payload = {
+            "appliedFacets": {},
+            "limit": WORKDAY_PAGE_SIZE,
+            "offset": offset,
+            "searchText": self.search_text,
+        }
+        response = self.scheduler.post(self.jobs_url, json=payload, headers=self.headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch_page(self, offset):
+        """Fetch a single page of postings starting at `offset`."""
+        return await asyncio.to_thread(self._post_page, offset)
+
+    async def _fetch_offsets(self, offsets, semaphore):
+        async def fetch_offset(offset):
+            async with semaphore:
+                try:
+                    return await self.fetch_page(offset)
+                except Exception as e:
+                    log.warning("[!] Workday request failed at offset %s: %s", offset, e)
+                    return None
+
+        return await asyncio.gather(*(fetch_offset(offset) for offset in offsets))
+
+    async def fetch_all(self, known_paths=None):
+        """
+        Fetch every posting reported by the site.
+
+        Args:
+            known_paths (set): External paths already stored. When given, pages are
+                fetched newest-first in waves and the crawl stops at the first page
+                made up entirely of known postings.
+
+        Returns:
+            dict: {"total": int, "jobPostings": list, "complete": bool} or None if the
+                first page failed. "complete" is true only when every page was fetched.
+        """
+        try:
+            first_page = await self.fetch_page(0)
+        except Exception as e:
+            log.warning("[!] Workday request failed for %s/%s: %s", self.tenant, self.site, e)
+            return None
+
+        # Workday only reports the real total on the first page
+        total = first_page.get("total", 0)
+        offsets = list(range(WORKDAY_PAGE_SIZE, total, WORKDAY_PAGE_SIZE))
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_postings(page_offsets):
+            pages = await self._fetch_offsets(page_offsets, semaphore)
+            return [None if page is None else page.get("jobPostings", []) for page in pages]
+
+        if known_paths is None:
+            log.info("[*] %s: %s jobs reported, fetching %s more pages", self.tenant, total, len(offsets))
+        else:
+            log.info("[*] %s: %s jobs reported, fetching until known jobs are reached", self.tenant, total)
+        postings, complete = await crawl_pages(
+            fetch_postings,
+            offsets,
+            first_page.get("jobPostings", []),
+            lambda posting: posting.get("externalPath"),
+            known=known_paths,
+            wave_size=self.concurrency,
+            label=self.tenant,
+        )
+        return {"total": total, "jobPostings": postings, "complete": complete}
+
+
+def fetch_workday_jobs(host, tenant, site, concurrency=8, known_paths=None):
+    """Synchronous wrapper that fetches every posting (or only the new ones) for one Workday site."""
+    client = WorkdayClient(host, tenant, site, concurrency=concurrency)
+    return asyncio.run(client.fetch_all(known_paths))
+
+
+class WorkdayAdapter(SourceAdapter):
+    """
+    Source adapter for a Workday career site.
+
+    Args:
+        id_separators (tuple): Markers before the requisition number in the last path
+            segment, tried in order ("_JR" for .../Title_JR1998467)
+        locale (str): Locale segment of the site's public URLs ("" for none)
+        browser_fallback (bool): Intercept the site's own API calls in Chromium when
+            the direct API fetch fails
+    """
+
+    known_field = "External Path"
+
+    def __init__(self, name, host, tenant, site, id_separators=("_",), locale="en-US",
+                 browser_fallback=False, label=None):
+        super().__init__(name, label)
+        self.host = host
+        self.tenant = tenant
+        self.site = site
+        self.id_separators = id_separators
+        self.site_url = f"https://{host}/{locale + '/' if locale else ''}{site}"
+        self.browser_fallback = browser_fallback
+
+    def job_id(self, external_path):
+        if not external_path:
+            return ""
+        last_part = external_path.split("/")[-1]
+        for separator in self.id_separators:
+            if separator in last_part:
+                return last_part.split(separator)[-1]
+        return external_path
+
+    def fetch(self, known, browser_pool=None):
+        json_data = fetch_workday_jobs(self.host, self.tenant, self.site, known_paths=known)
+        if (not json_data or not json_data.get("jobPostings")) and self.browser_fallback:
+            log.warning("[!] Direct Workday API fetch failed, falling back to browser interception...")
+            json_data = self.fetch_with_browser(browser_pool)
+        if not json_data or not json_data.get("jobPostings"):
+            return None, False
+        return json_data, json_data.get("complete", False)
+
+    def parse(self, json_data):
+        for job in json_data.get("jobPostings", []):
+            external_path = job.get("externalPath", "")
+            bullet_fields = job.get("bulletFields", [])
+            extra = {
+                "External Path": external_path,
+                "Bullet Fields": bullet_fields,
+                "Requisition ID": bullet_fields[0] if bullet_fields else "",
+            }
+            # Keep every other field Workday returns
+            for key, value in job.items():
+                if key not in ("externalPath", "title", "locationsText", "postedOn", "bulletFields"):
+                    extra[key] = value
+            yield JobRecord(self.job_id(external_path), job.get("title", ""), job.get("locationsText", ""),
+                            job.get("postedOn", ""), f"{self.site_url}{external_path}", extra)
+
+    def fetch_with_browser(self, browser_pool=None, max_iterations=10):
+        """Fallback: page through the careers site in Chromium and intercept each jobs API response."""
+        from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+        from browser_pool import TARGET_SELECTOR, find_first_visible, run_in_browser, wait_for_change
+
+        jobs_api_path = f"/wday/cxs/{self.tenant}/{self.site}/jobs"
+        scheduler = get_scheduler()
+        all_jobs = []
+
+        def click_and_wait_for_jobs(page, locator, timeout=5000):
+            try:
+                with page.expect_response(lambda r: jobs_api_path in r.url, timeout=timeout):
+                    locator.click()
+            except PlaywrightTimeoutError:
+                log.debug("[*] No jobs API response after click")
+
+        def collect(context):
+            page = context.new_page()
+
+            def handle_response(response):
+                if jobs_api_path in response.url and response.status == 200:
+                    log.debug("[+] Intercepted API response: %s", response.url)
+                    try:
+                        job_postings = response.json().get("jobPostings", [])
+                        log.debug("Found %s jobs in this batch", len(job_postings))
+                        metrics.count("pages")
+                        all_jobs.extend(job_postings)
+                    except Exception as e:
+                        log.warning("Failed to parse JSON: %s", e)
+
+            page.on("response", handle_response)
+
+            log.info("[*] Navigating to %s...", self.site_url)
+            try:
+                # Done as soon as the first page of jobs arrives, not when the page finishes loading
+                with page.expect_response(lambda r: jobs_api_path in r.url and r.status == 200, timeout=60000):
+                    page.goto(self.site_url, timeout=60000, wait_until="commit")
+            except PlaywrightTimeoutError:
+                log.warning("[!] No jobs API response from %s", self.site_url)
+                return
+
+            # Load further pages with "Load More" buttons or pagination, if the site has them
+            for iteration in range(max_iterations):
+                log.debug("[*] Attempting to load more jobs (iteration %s)...", iteration + 1)
+                scheduler.throttle(page.url)
+
+                try:
+                    target = find_first_visible(page, PAGINATION_TARGETS)
+                    if target is None:
+                        # Scrolling may render the controls; wait for that rather than a fixed delay
+                        wait_for_change(page, lambda: page.evaluate("window.scrollTo(0, document.body.scrollHeight)"),
+                                        jobs_api_path, timeout=2000)
+                        target = find_first_visible(page, PAGINATION_TARGETS)
+                    if target is None:
+                        log.info("[*] No pagination found, stopping...")
+                        break
+                    log.debug("[+] Found pagination control: %s", PAGINATION_TARGETS[target])
+                    click_and_wait_for_jobs(page, page.locator(TARGET_SELECTOR).first)
+                except PlaywrightError as e:
+                    log.info("[*] No more pages available, stopping... (%s)", e)
+                    break
+
+        run_in_browser(self.name, collect, browser_pool, allowed_domains=WORKDAY_DOMAINS)
+        if not all_jobs:
+            return None
+        log.info("[+] Collected total of %s jobs across all pages", len(all_jobs))
+        return {"jobPostings": all_jobs}
+
+
+WORKDAY_SITES = [
+    WorkdayAdapter("accenture", "accenture.wd103.myworkdayjobs.com", "accenture", "AccentureCareers",
+                   id_separators=("_R", "R")),
+    WorkdayAdapter("nvidia", "nvidia.wd5.myworkdayjobs.com", "nvidia", "NVIDIAExternalCareerSite",
+                   id_separators=("_JR", "JR"), browser_fallback=True, label="NVIDIA"),
+    WorkdayAdapter("salesforce", "salesforce.wd12.myworkdayjobs.com", "salesforce", "External_Career_Site",
+                   id_separators=("_",), locale="", browser_fallback=True),
+]
+
+for _adapter in WORKDAY_SITES:
+    register(_adapter)